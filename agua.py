@@ -1,23 +1,9 @@
 # main.py - Mandala sinusoidal pulsante
-import glfw
-from OpenGL.GL import *
-from OpenGL.GL.shaders import compileProgram, compileShader
-import numpy as np
-import time
+from shader_scene import ShaderScene
 
 RESOLUTION = (1280, 720)
 FPS = 30
 
-VERTEX_SHADER = """
-#version 330 core
-layout (location = 0) in vec2 aPos;
-out vec2 vPos;
-void main() {
-    vPos = aPos;
-    gl_Position = vec4(aPos, 0.0, 1.0);
-}
-"""
-
 FRAGMENT_SHADER = """
 #version 330 core
 in vec2 vPos;
@@ -25,28 +11,10 @@ uniform float u_time;
 uniform vec2 u_resolution;
 out vec4 FragColor;
 
-// FunciÃ³n W adaptada del cÃ³digo
-vec2 W(vec2 p, float t) {
-    p = (p + 3.0) * 4.0;
-    
-    for (int i = 0; i < 3; i++) {
-        p += cos(p.yx * 3.0 + vec2(t, 1.57)) / 3.0;
-        p += sin(p.yx + t + vec2(1.57, 0.0)) / 2.0;
-        p *= 1.3;
-    }
-    
-    p += fract(sin(p + vec2(13, 7)) * 5e5) * 0.03 - 0.015;
-    return mod(p, 2.0) - 1.0;
-}
+#include "warp.glsl"
 
-// Paleta de colores
-vec3 palette(float t) {
-    vec3 a = vec3(0.5, 0.5, 0.5);
-    vec3 b = vec3(0.5, 0.5, 0.5);
-    vec3 c = vec3(1.0, 1.0, 1.0);
-    vec3 d = vec3(0.0, 0.33, 0.67);
-    return a + b * cos(6.28318 * (c * t + d));
-}
+#define PALETTE_D vec3(0.0, 0.33, 0.67)
+#include "palette.glsl"
 
 void main() {
     vec2 uv = (vPos * 2.0 - vec2(1.0)) * vec2(u_resolution.x / u_resolution.y, 1.0);
@@ -79,52 +47,14 @@ void main() {
 }
 """
 
-class Intro:
-    def __init__(self):
-        glfw.init()
-        self.window = glfw.create_window(RESOLUTION[0], RESOLUTION[1], "ThÃ¶Ev - Pulsante", None, None)
-        glfw.make_context_current(self.window)
-        
-        self.shader = compileProgram(
-            compileShader(VERTEX_SHADER, GL_VERTEX_SHADER),
-            compileShader(FRAGMENT_SHADER, GL_FRAGMENT_SHADER)
-        )
-        
-        vertices = np.array([-1,-1, -1,1, 1,1, 1,-1], dtype=np.float32)
-        
-        self.vao = glGenVertexArrays(1)
-        self.vbo = glGenBuffers(1)
-        
-        glBindVertexArray(self.vao)
-        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
-        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
-        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 8, ctypes.c_void_p(0))
-        glEnableVertexAttribArray(0)
-        
-        self.start = time.time()
-    
-    def run(self):
-        while not glfw.window_should_close(self.window):
-            t = time.time() - self.start
-            
-            if t > 10.0:  # 10 segundos para ver el latido
-                break
-            
-            glClearColor(0, 0, 0, 1)
-            glClear(GL_COLOR_BUFFER_BIT)
-            
-            glUseProgram(self.shader)
-            glUniform1f(glGetUniformLocation(self.shader, "u_time"), t)
-            glUniform2f(glGetUniformLocation(self.shader, "u_resolution"), RESOLUTION[0], RESOLUTION[1])
-            
-            glBindVertexArray(self.vao)
-            glDrawArrays(GL_TRIANGLE_FAN, 0, 4)
-            
-            glfw.swap_buffers(self.window)
-            glfw.poll_events()
-            time.sleep(1.0/FPS)
-        
-        glfw.terminate()
+
+class Intro(ShaderScene):
+    title = "ThÃ¶Ev - Pulsante"
+    resolution = RESOLUTION
+    fps = FPS
+    duration = 10.0  # 10 segundos para ver el latido
+    fragment_shader = FRAGMENT_SHADER
+
 
 if __name__ == "__main__":
     Intro().run()
@@ -0,0 +1,68 @@
+# bench_frame_copy.py - Bytes copiados por frame al enviar a ffmpeg
+#
+# Compara el camino anterior de VideoRenderer (frombuffer -> flipud ->
+# tobytes -> write) con el actual (memoryview del buffer de glReadPixels,
+# volteo en ffmpeg con vflip). No necesita OpenGL: simula el buffer que
+# devuelve glReadPixels con la resolución de config/config.json.
+#
+#   python3 bench_frame_copy.py [--frames N]
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+from config_loader import CONFIG
+
+RESOLUTION = tuple(CONFIG['render']['resolution'])
+
+
+def write_flipped(sink, pixels, width, height):
+    """Camino anterior: copia completa del frame volteado."""
+    image = np.frombuffer(pixels, dtype=np.uint8).reshape(height, width, 3)
+    image = np.flipud(image)
+    sink.write(image.tobytes())
+
+
+def write_zero_copy(sink, pixels, width, height):
+    """Camino actual: el buffer va directo al sink, ffmpeg voltea."""
+    sink.write(memoryview(pixels))
+
+
+def measure(write, frames, width, height):
+    """Devuelve (bytes asignados por frame, ms por frame)."""
+    pixels = np.random.randint(0, 256, width * height * 3, dtype=np.uint8).tobytes()
+
+    with open(os.devnull, 'wb') as sink:
+        tracemalloc.start()
+        for _ in range(frames):
+            tracemalloc.reset_peak()
+            write(sink, pixels, width, height)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for _ in range(frames):
+            write(sink, pixels, width, height)
+        elapsed = time.perf_counter() - start
+
+    return peak, elapsed / frames * 1000.0
+
+
+def main():
+    frames = 60
+    if '--frames' in sys.argv:
+        frames = int(sys.argv[sys.argv.index('--frames') + 1])
+
+    width, height = RESOLUTION
+    frame_bytes = width * height * 3
+    print(f"Frame {width}x{height} rgb24 = {frame_bytes / 1e6:.1f} MB, {frames} frames\n")
+
+    for label, write in (("antes (flipud + tobytes)", write_flipped),
+                         ("ahora (memoryview + vflip)", write_zero_copy)):
+        copied, ms = measure(write, frames, width, height)
+        print(f"{label:28s} {copied / 1e6:6.2f} MB copiados/frame  {ms:7.2f} ms/frame")
+
+
+if __name__ == "__main__":
+    main()
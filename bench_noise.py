@@ -0,0 +1,139 @@
+# bench_noise.py - Megapíxeles/segundo: noise_ref (NumPy) frente al shader GL
+#
+#   python3 bench_noise.py [--size WxH] [--frames N] [--headless] [--cpu-only]
+#
+# La parte CPU mide las funciones de ruido sueltas y las escenas portadas
+# en noise_ref.py a la resolución --size. La parte GL dibuja la misma
+# escena (brana_proton / brana_electron) a su resolución de config con
+# glFinish tras cada frame, y compara el tiempo por frame de las escenas
+# con fbm/curl procedural frente a la textura de noise_texture.py. Si
+# OpenGL no está instalado se omite.
+import gl_context  # antes de OpenGL (--headless)
+import time
+import argparse
+import importlib
+import noise_ref
+
+from config_loader import CONFIG, CONFIG_ARGS
+
+# escena de noise_ref -> (módulo, clase ShaderScene)
+GL_SCENES = {
+    'proton': ('brana_proton', 'Cortina'),
+    'electron': ('brana_electron', 'CortinaElectron'),
+}
+
+# Escenas con rama NOISE_TEXTURE
+TEXTURE_SCENES = {
+    'bigbang': ('bigbang', 'BigBang'),
+    'bigbangV2': ('bigbangV2', 'BigBangV2'),
+    'brana_colision': ('brana_colision', 'BranaColision'),
+    'brana_electron': ('brana_electron', 'CortinaElectron'),
+}
+
+
+def megapixels_per_second(pixels, frames, elapsed):
+    return pixels * frames / elapsed / 1e6 if elapsed > 0 else 0.0
+
+
+def bench_cpu(width, height, frames):
+    x, y = noise_ref.pixel_grid(width, height)
+    functions = {
+        'fbm': lambda t: noise_ref.fbm(x + t, y),
+        'curl': lambda t: noise_ref.curl(x, y, t),
+        'bumpFunc': lambda t: noise_ref.bump_func(x, y, t),
+    }
+    for name, (render, curvature_key) in noise_ref.SCENES.items():
+        curvature = CONFIG['branas'][curvature_key]
+        functions[name] = lambda t, r=render, c=curvature: r(t, width, height, c)
+
+    results = {}
+    for name, function in functions.items():
+        start = time.perf_counter()
+        for frame in range(frames):
+            function(1.0 + frame / 30.0)
+        results[name] = megapixels_per_second(width * height, frames, time.perf_counter() - start)
+    return results
+
+
+def seconds_per_frame(scene, frames):
+    from OpenGL.GL import glFinish
+    scene.draw(0.0)
+    glFinish()  # compilación y primer frame fuera de la medida
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        scene.draw(1.0 + frame / 30.0)
+        glFinish()
+    return (time.perf_counter() - start) / frames
+
+
+def bench_gl(frames):
+    """Devuelve ({escena: MP/s}, {escena: (s/frame procedural, s/frame textura)})."""
+    try:
+        import OpenGL.GL  # noqa: F401
+    except ImportError:
+        return None
+
+    resolution = tuple(CONFIG['render']['resolution'])
+    context = gl_context.create_context(*resolution, "ThöEv - bench_noise")
+
+    rates = {}
+    for name, (module_name, class_name) in GL_SCENES.items():
+        scene = getattr(importlib.import_module(module_name), class_name)(context=context)
+        rates[name] = megapixels_per_second(scene.width * scene.height, 1,
+                                            seconds_per_frame(scene, frames))
+        scene.release()
+
+    frame_times = {}
+    for name, (module_name, class_name) in TEXTURE_SCENES.items():
+        scene_class = getattr(importlib.import_module(module_name), class_name)
+        times = []
+        for noise_texture in (False, True):
+            scene = scene_class(context=context, noise_texture=noise_texture)
+            times.append(seconds_per_frame(scene, frames))
+            scene.release()
+        frame_times[name] = tuple(times)
+
+    context.terminate()
+    return rates, frame_times
+
+
+def main():
+    # parse_args (no parse_known_args): un flag mal escrito es un error, no se ignora
+    parser = argparse.ArgumentParser(parents=[CONFIG_ARGS], allow_abbrev=False)
+    parser.add_argument('--size', default='480x270')
+    parser.add_argument('--frames', type=int, default=3)
+    parser.add_argument('--cpu-only', action='store_true')
+    # Los leen gl_context y program_cache; se declaran para que el parser los acepte
+    parser.add_argument('--headless', action='store_true')
+    parser.add_argument('--no-program-cache', action='store_true')
+    options = parser.parse_args()
+    width, height = (int(v) for v in options.size.split('x'))
+    frames = options.frames
+
+    print(f"CPU (NumPy) {width}x{height}, {frames} frames")
+    for name, rate in bench_cpu(width, height, frames).items():
+        print(f"  {name:10s} {rate:8.2f} MP/s")
+
+    if options.cpu_only:
+        return
+
+    gl_results = bench_gl(frames * 10)
+    if gl_results is None:
+        print("\nGL: PyOpenGL no disponible, solo CPU.")
+        return
+
+    rates, frame_times = gl_results
+    resolution = tuple(CONFIG['render']['resolution'])
+    print(f"\nGL {resolution[0]}x{resolution[1]}, {frames * 10} frames")
+    for name, rate in rates.items():
+        print(f"  {name:10s} {rate:8.2f} MP/s")
+
+    print("\nfbm/curl        procedural     textura")
+    for name, (procedural, texture) in frame_times.items():
+        print(f"  {name:14s} {procedural * 1000.0:7.2f} ms  {texture * 1000.0:7.2f} ms  "
+              f"x{procedural / texture if texture > 0 else 0.0:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# bench_startup.py - Arranque en frío (compilar GLSL) frente a caliente (cache)
+#
+#   python3 bench_startup.py [escenas...] [--headless]
+#
+# Para cada escena compila y enlaza el programa desde cero y después lo
+# carga desde cache/programs/ (program_cache.py). La cache de shaders
+# propia de Mesa se desactiva para que el frío sea de verdad frío.
+import os
+os.environ.setdefault('MESA_SHADER_CACHE_DISABLE', 'true')
+
+from gl_context import create_context  # antes de OpenGL (--headless)
+from config_loader import CONFIG
+from OpenGL.GL import glDeleteProgram, glFinish
+from shader_library import preprocess
+import program_cache
+from render_all import SCENES, load_scene, parse_scene_args
+
+RESOLUTION = tuple(CONFIG['render']['resolution'])
+
+
+def measure(scene_class):
+    """Devuelve (segundos compilando, segundos cargando el binario o None)."""
+    vertex = preprocess(scene_class.vertex_shader)
+    fragment = preprocess(scene_class.fragment_shader)
+
+    program, _, cold = program_cache.load_program(vertex, fragment, use_cache=False)
+    glFinish()
+    if not program_cache.binary_supported():
+        glDeleteProgram(program)
+        return cold, None
+    program_cache.save_binary(program, program_cache.cache_path(vertex, fragment))
+    glDeleteProgram(program)
+
+    program, origin, warm = program_cache.load_program(vertex, fragment, use_cache=True)
+    glFinish()
+    glDeleteProgram(program)
+    return cold, warm if origin == 'cache' else None
+
+
+def main():
+    names = parse_scene_args()[1] or list(SCENES)
+    context = create_context(RESOLUTION[0], RESOLUTION[1], "ThöEv - bench_startup")
+    print(f"Driver: {program_cache.driver_string()}\n")
+    print("Escena            Frío (ms)  Caliente (ms)")
+    try:
+        for name in names:
+            cold, warm = measure(load_scene(name))
+            if warm is None:
+                print(f"{name:16s} {cold * 1000.0:10.1f}  sin binarios en este driver")
+            else:
+                print(f"{name:16s} {cold * 1000.0:10.1f} {warm * 1000.0:14.1f}   x{cold / warm:.0f}")
+    finally:
+        context.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,15 @@
 # bigbangV2.py - Colision entre branas (proton + electron sin cambios)
-import os
-import glfw
-from OpenGL.GL import *
-from OpenGL.GL.shaders import compileProgram, compileShader
-import numpy as np
-import time
-import json
-import ctypes
-from render_utils import VideoRenderer, parse_render_args
-
-with open('config/config.json', 'r') as f:
-    CONFIG = json.load(f)
+from shader_scene import ShaderScene
+from render_utils import parse_render_args
+from config_loader import CONFIG
+import math
+
 
 RESOLUTION = tuple(CONFIG['render']['resolution'])
 FPS = CONFIG['render']['fps']
 
-VERTEX_SHADER = """
-#version 330 core
-layout (location = 0) in vec2 aPos;
-out vec2 vPos;
-void main() {
-    vPos = aPos;
-    gl_Position = vec4(aPos, 0.0, 1.0);
-}
-"""
+CURTAIN_DURATION = 20.0  # duration del shader: las cortinas cruzan la pantalla en 20 s
+MASK_EDGE = 0.1          # semiancho del smoothstep de protonMask / electronMask
 
 FRAGMENT_SHADER = """
 #version 330 core
@@ -34,65 +20,8 @@ uniform float u_curvature_left;
 uniform float u_curvature_right;
 out vec4 FragColor;
 
-float hash(vec2 p) {
-    return fract(sin(dot(p, vec2(127.1, 311.7))) * 43758.5453);
-}
-
-float noise(vec2 p) {
-    vec2 i = floor(p);
-    vec2 f = fract(p);
-    f = f * f * (3.0 - 2.0 * f);
-
-    float a = hash(i);
-    float b = hash(i + vec2(1.0, 0.0));
-    float c = hash(i + vec2(0.0, 1.0));
-    float d = hash(i + vec2(1.0, 1.0));
-
-    return mix(mix(a, b, f.x), mix(c, d, f.x), f.y);
-}
-
-float fbm(vec2 p) {
-    float value = 0.0;
-    float amplitude = 0.5;
-    float frequency = 1.0;
-
-    for (int i = 0; i < 5; i++) {
-        value += amplitude * noise(p * frequency);
-        frequency *= 2.0;
-        amplitude *= 0.5;
-    }
-    return value;
-}
-
-vec2 W(vec2 p, float t) {
-    p = (p + 3.0) * 4.0;
-
-    for (int i = 0; i < 3; i++) {
-        p += cos(p.yx * 3.0 + vec2(t, 1.57)) / 3.0;
-        p += sin(p.yx + t + vec2(1.57, 0.0)) / 2.0;
-        p *= 1.3;
-    }
-
-    p += fract(sin(p + vec2(13, 7)) * 5e5) * 0.03 - 0.015;
-    return mod(p, 2.0) - 1.0;
-}
-
-float bumpFunc(vec2 p, float t) {
-    return length(W(p, t)) * 0.7071;
-}
-
-vec2 curl(vec2 p, float t) {
-    float eps = 0.1;
-    float n1 = fbm(p + vec2(0.0, eps) + t * 0.1);
-    float n2 = fbm(p + vec2(0.0, -eps) + t * 0.1);
-    float n3 = fbm(p + vec2(eps, 0.0) + t * 0.1);
-    float n4 = fbm(p + vec2(-eps, 0.0) + t * 0.1);
-
-    float dx = (n1 - n2) / (2.0 * eps);
-    float dy = (n3 - n4) / (2.0 * eps);
-
-    return vec2(dy, -dx);
-}
+#include "noise.glsl"
+#include "warp.glsl"
 
 vec2 velocityField(vec2 p, float t) {
     vec2 mainFlow = vec2(-1.0, 0.0);
@@ -158,6 +87,8 @@ void main() {
     vec2 uvElectron = vec2(uv.x - curtainCurvedElectron, uv.y);
 
     // PROTON (brana_proton.py)
+    vec3 protonCol = vec3(0.0);
+#ifndef SKIP_PROTON
     vec2 eps = vec2(4.0 / u_resolution.y, 0.0);
     float f = bumpFunc(uvProtonSphere, t);
     float fx = bumpFunc(uvProtonSphere - eps.xy, t);
@@ -186,13 +117,16 @@ void main() {
 
     vec3 mercuryBase = vec3(0.8, 0.85, 0.9);
     vec3 texCol = mercuryBase * (f * 0.5 + 0.5);
-    vec3 protonCol = (texCol * (diff * vec3(1.0, 0.97, 0.92) * 2.0 + 0.5) +
+    protonCol = (texCol * (diff * vec3(1.0, 0.97, 0.92) * 2.0 + 0.5) +
                       vec3(1.0, 0.9, 0.8) * spec * 2.0) * atten;
 
     float ref = max(dot(reflect(rd, sn), vec3(1.0)), 0.0);
     protonCol += protonCol * pow(ref, 4.0) * vec3(0.4, 0.5, 0.6) * 2.0;
+#endif
 
     // ELECTRON (brana_electron.py)
+    vec3 electronCol = vec3(0.0);
+#ifndef SKIP_ELECTRON
     vec2 flow = velocityField(uvElectron, t);
     vec2 uvAdvected = uvElectron;
     float dt = 0.05;
@@ -223,13 +157,14 @@ void main() {
     vec3 glowBlue = vec3(0.5, 0.85, 1.0);
     vec3 edgeBlue = vec3(0.7, 0.9, 1.0);
 
-    vec3 electronCol = mix(gasBlue, glowBlue, turbulence);
+    electronCol = mix(gasBlue, glowBlue, turbulence);
     electronCol *= density;
     electronCol += vec3(0.4, 0.8, 1.0) * vortex * 0.4;
     electronCol += edgeBlue * edgeTurbulence * 0.8;
 
     float atmosphericGlow = fbm(uvFinal * 1.5 + t * 0.2) * 0.3;
     electronCol += gasBlue * atmosphericGlow * 0.15;
+#endif
 
     vec3 col = protonCol * protonMask + electronCol * electronMask;
     col *= max(protonMask, electronMask);
@@ -239,112 +174,62 @@ void main() {
 """
 
 
-class BigBangV2:
-    def __init__(self, render_video=False):
-        glfw.init()
-        self.window = glfw.create_window(
-            RESOLUTION[0], RESOLUTION[1], "BigBangV2", None, None
-        )
-        glfw.make_context_current(self.window)
-
-        glViewport(0, 0, RESOLUTION[0], RESOLUTION[1])
-
-        self.shader = compileProgram(
-            compileShader(VERTEX_SHADER, GL_VERTEX_SHADER),
-            compileShader(FRAGMENT_SHADER, GL_FRAGMENT_SHADER),
-        )
-
-        vertices = np.array([-1, -1, -1, 1, 1, 1, 1, -1], dtype=np.float32)
-
-        self.vao = glGenVertexArrays(1)
-        self.vbo = glGenBuffers(1)
-
-        glBindVertexArray(self.vao)
-        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
-        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
-        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 8, ctypes.c_void_p(0))
-        glEnableVertexAttribArray(0)
-
-        self.start = time.time()
-        output_name = os.path.splitext(os.path.basename(__file__))[0] + ".mp4"
-        self.renderer = VideoRenderer(RESOLUTION[0], RESOLUTION[1], FPS, output_name)
-        if render_video:
-            self.renderer.enable()
-
-    def run(self):
-        duration = 12.0
-        frame_time = 1.0 / FPS
-
-        if self.renderer.enabled:
-            total_frames = int(duration * FPS)
-            for frame in range(total_frames):
-                if glfw.window_should_close(self.window):
-                    break
-
-                t = frame * frame_time
-
-                glClearColor(0, 0, 0, 1)
-                glClear(GL_COLOR_BUFFER_BIT)
-
-                glUseProgram(self.shader)
-                glUniform1f(glGetUniformLocation(self.shader, "u_time"), t)
-                glUniform2f(
-                    glGetUniformLocation(self.shader, "u_resolution"),
-                    RESOLUTION[0],
-                    RESOLUTION[1],
-                )
-                glUniform1f(
-                    glGetUniformLocation(self.shader, "u_curvature_left"),
-                    CONFIG['branas']['curvature_left'],
-                )
-                glUniform1f(
-                    glGetUniformLocation(self.shader, "u_curvature_right"),
-                    CONFIG['branas']['curvature_right'],
-                )
-
-                glBindVertexArray(self.vao)
-                glDrawArrays(GL_TRIANGLE_FAN, 0, 4)
-
-                self.renderer.capture_frame()
-
-                glfw.swap_buffers(self.window)
-                glfw.poll_events()
-
-            self.renderer.generate_video()
-        else:
-            while not glfw.window_should_close(self.window):
-                t = time.time() - self.start
-
-                if t > duration:
-                    break
-
-                glClearColor(0, 0, 0, 1)
-                glClear(GL_COLOR_BUFFER_BIT)
-
-                glUseProgram(self.shader)
-                glUniform1f(glGetUniformLocation(self.shader, "u_time"), t)
-                glUniform2f(
-                    glGetUniformLocation(self.shader, "u_resolution"),
-                    RESOLUTION[0],
-                    RESOLUTION[1],
-                )
-                glUniform1f(
-                    glGetUniformLocation(self.shader, "u_curvature_left"),
-                    CONFIG['branas']['curvature_left'],
-                )
-                glUniform1f(
-                    glGetUniformLocation(self.shader, "u_curvature_right"),
-                    CONFIG['branas']['curvature_right'],
-                )
-
-                glBindVertexArray(self.vao)
-                glDrawArrays(GL_TRIANGLE_FAN, 0, 4)
-
-                glfw.swap_buffers(self.window)
-                glfw.poll_events()
-                time.sleep(frame_time)
-
-        glfw.terminate()
+def warp_time(t):
+    """warpTime() del shader: cámara lenta x0.5 entre 6-8 s y x0.25 entre 9-10 s."""
+    if t <= 6.0:
+        return t
+    if t < 8.0:
+        return 6.0 + (t - 6.0) * 0.5
+    if t < 9.0:
+        return 7.0 + (t - 8.0)
+    if t < 10.0:
+        return 8.0 + (t - 9.0) * 0.25
+    return t - 1.75
+
+
+class BigBangV2(ShaderScene):
+    title = "BigBangV2"
+    resolution = RESOLUTION
+    fps = FPS
+    duration = 12.0
+    config = CONFIG
+    fragment_shader = FRAGMENT_SHADER
+    # Franja del protón sin el electrón y viceversa (ver regions)
+    region_variants = (('ELECTRON',), ('PROTON',))
+
+    def static_uniforms(self):
+        return {
+            'u_curvature_left': self.config['branas']['curvature_left'],
+            'u_curvature_right': self.config['branas']['curvature_right'],
+        }
+
+    def regions(self, t, width):
+        """Franjas por brana a partir de la posición de las cortinas.
+
+        protonMask es 0 a la derecha de la cortina curvada del protón más
+        MASK_EDGE y electronMask a la izquierda de la del electrón menos
+        MASK_EDGE; la curvatura desplaza la cortina como mucho |c| en y = +-1.
+        Antes del contacto cada píxel sombrea solo su brana y el hueco
+        central queda negro; donde las dos máscaras se solapan se usa el
+        shader completo.
+        """
+        aspect = self.width / self.height
+        travel = warp_time(t) / CURTAIN_DURATION * aspect * 2.0
+        curvature_left = self.config['branas']['curvature_left']
+        curvature_right = self.config['branas']['curvature_right']
+        proton_edge = -aspect + travel + max(curvature_left, 0.0) + MASK_EDGE
+        electron_edge = aspect - travel - max(curvature_right, 0.0) - MASK_EDGE
+
+        def column(x):
+            return (x / aspect + 1.0) * 0.5 * width
+
+        # Píxeles [0, proton_end) pueden tener protón y [electron_start, width) electrón
+        proton_end = min(width, max(0, math.ceil(column(proton_edge))))
+        electron_start = min(width, max(0, math.floor(column(electron_edge))))
+        if proton_end <= electron_start:
+            return [(0, proton_end, ('ELECTRON',)), (electron_start, width, ('PROTON',))]
+        return [(0, electron_start, ('ELECTRON',)), (electron_start, proton_end, ()),
+                (proton_end, width, ('PROTON',))]
 
 
 if __name__ == "__main__":
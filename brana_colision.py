@@ -1,30 +1,11 @@
 # brana_colision.py - Colision entre branas
-import os
-import glfw
-from OpenGL.GL import *
-from OpenGL.GL.shaders import compileProgram, compileShader
-import numpy as np
-import time
-import json
-import ctypes
-from render_utils import VideoRenderer, parse_render_args
-
-with open('config/config.json', 'r') as f:
-    CONFIG = json.load(f)
+from shader_scene import ShaderScene
+from render_utils import parse_render_args
+from config_loader import CONFIG
 
 RESOLUTION = tuple(CONFIG['render']['resolution'])
 FPS = CONFIG['render']['fps']
 
-VERTEX_SHADER = """
-#version 330 core
-layout (location = 0) in vec2 aPos;
-out vec2 vPos;
-void main() {
-    vPos = aPos;
-    gl_Position = vec4(aPos, 0.0, 1.0);
-}
-"""
-
 FRAGMENT_SHADER = """
 #version 330 core
 in vec2 vPos;
@@ -35,73 +16,9 @@ uniform float u_curvature_right;
 uniform float u_electron_gas_speed;
 out vec4 FragColor;
 
-float hash(vec2 p) {
-    return fract(sin(dot(p, vec2(127.1, 311.7))) * 43758.5453);
-}
-
-float noise(vec2 p) {
-    vec2 i = floor(p);
-    vec2 f = fract(p);
-    f = f * f * (3.0 - 2.0 * f);
-
-    float a = hash(i);
-    float b = hash(i + vec2(1.0, 0.0));
-    float c = hash(i + vec2(0.0, 1.0));
-    float d = hash(i + vec2(1.0, 1.0));
-
-    return mix(mix(a, b, f.x), mix(c, d, f.x), f.y);
-}
-
-float fbm(vec2 p) {
-    float value = 0.0;
-    float amplitude = 0.5;
-    float frequency = 1.0;
-
-    for (int i = 0; i < 5; i++) {
-        value += amplitude * noise(p * frequency);
-        frequency *= 2.0;
-        amplitude *= 0.5;
-    }
-    return value;
-}
-
-vec3 palette(float t) {
-    vec3 a = vec3(0.5, 0.5, 0.5);
-    vec3 b = vec3(0.5, 0.5, 0.5);
-    vec3 c = vec3(1.0, 1.0, 1.0);
-    vec3 d = vec3(0.263, 0.416, 0.557);
-    return a + b * cos(6.28318 * (c * t + d));
-}
-
-vec2 W(vec2 p, float t) {
-    p = (p + 3.0) * 4.0;
-
-    for (int i = 0; i < 3; i++) {
-        p += cos(p.yx * 3.0 + vec2(t, 1.57)) / 3.0;
-        p += sin(p.yx + t + vec2(1.57, 0.0)) / 2.0;
-        p *= 1.3;
-    }
-
-    p += fract(sin(p + vec2(13, 7)) * 5e5) * 0.03 - 0.015;
-    return mod(p, 2.0) - 1.0;
-}
-
-float bumpFunc(vec2 p, float t) {
-    return length(W(p, t)) * 0.7071;
-}
-
-vec2 curl(vec2 p, float t) {
-    float eps = 0.1;
-    float n1 = fbm(p + vec2(0.0, eps) + t * 0.1);
-    float n2 = fbm(p + vec2(0.0, -eps) + t * 0.1);
-    float n3 = fbm(p + vec2(eps, 0.0) + t * 0.1);
-    float n4 = fbm(p + vec2(-eps, 0.0) + t * 0.1);
-
-    float dx = (n1 - n2) / (2.0 * eps);
-    float dy = (n3 - n4) / (2.0 * eps);
-
-    return vec2(dy, -dx);
-}
+#include "noise.glsl"
+#include "palette.glsl"
+#include "warp.glsl"
 
 void main() {
     vec2 uv = vPos;
@@ -137,15 +54,21 @@ void main() {
     vec2 toContact = vec2(uv.x - contactX, uv.y);
     float scatter = impact * smoothstep(0.45, 0.0, distContact);
     vec2 scatterDir = normalize(toContact + vec2(0.001, 0.0));
-    vec2 scatterJitter = vec2(
+    // Secciones SKIP_*: shader_cost.py las apaga una a una para medir su coste
+    vec2 scatterJitter = vec2(0.0);
+#ifndef SKIP_ELECTRON
+    scatterJitter = vec2(
         fbm(uv * 6.0 + gasTime * 1.2),
         fbm(uv * 6.0 - gasTime * 1.1)
     ) - 0.5;
+#endif
     vec2 electronUV = uv;
     electronUV += scatterDir * scatter * 0.08;
     electronUV += scatterJitter * scatter * 0.12;
     electronUV.x += impact * 0.12;
 
+    vec3 protonCol = vec3(0.0);
+#ifndef SKIP_PROTON
     float tMetal = t * 0.5;
     vec2 eps = vec2(4.0 / u_resolution.y, 0.0);
     float f = bumpFunc(uv, tMetal);
@@ -160,10 +83,13 @@ void main() {
     float diff = pow(max(dot(sn, ld), 0.0), 4.0);
     float spec = pow(max(dot(reflect(-ld, sn), -rd), 0.0), 12.0);
     vec3 mercuryBase = vec3(0.8, 0.85, 0.9);
-    vec3 protonCol = mercuryBase * (f * 0.5 + 0.5);
+    protonCol = mercuryBase * (f * 0.5 + 0.5);
     protonCol = protonCol * (diff * vec3(1.0, 0.97, 0.92) * 2.0 + 0.5)
         + vec3(1.0, 0.9, 0.8) * spec * 2.0;
+#endif
 
+    vec3 electronCol = vec3(0.0);
+#ifndef SKIP_ELECTRON
     float turbulence = fbm(electronUV * 3.0 + gasTime * 0.3);
     float density = turbulence * 0.6 + 0.3;
     float vortex = length(curl(electronUV * 4.0, gasTime)) * 1.5;
@@ -171,12 +97,13 @@ void main() {
     vec3 gasBlue = vec3(0.3, 0.7, 1.0);
     vec3 glowBlue = vec3(0.5, 0.85, 1.0);
     vec3 edgeBlue = vec3(0.7, 0.9, 1.0);
-    vec3 electronCol = mix(gasBlue, glowBlue, turbulence);
+    electronCol = mix(gasBlue, glowBlue, turbulence);
     electronCol *= density;
     electronCol += vec3(0.4, 0.8, 1.0) * vortex * 0.4;
 
     float edgeTurbulence = fbm(electronUV * 8.0 + gasTime * 3.0);
     electronCol += edgeBlue * edgeTurbulence * scatter * 0.8;
+#endif
 
     vec3 fusedCol = mix(protonCol, electronCol, 0.45);
     fusedCol += vec3(1.0, 0.95, 0.85) * contactBand * 1.8;
@@ -184,10 +111,11 @@ void main() {
     vec3 col = protonCol * protonMask + electronCol * electronMask;
     col = mix(col, fusedCol, contactBand);
 
+    vec3 bigbangCol = vec3(0.0);
+#ifndef SKIP_BIGBANG
     vec2 uvBig = vPos * 10.0;
     uvBig.x *= aspect;
     vec2 uv0 = uvBig;
-    vec3 bigbangCol = vec3(0.0);
     for (float i = 0.0; i < 4.0; i++) {
         uvBig = fract(uvBig * 1.5) - 0.5;
         float d = length(uvBig) * exp(-length(uv0));
@@ -197,6 +125,7 @@ void main() {
         d = pow(0.01 / d, 1.2);
         bigbangCol += pal * d;
     }
+#endif
 
     float bigbangMix = smoothstep(0.1, 0.9, impact) * smoothstep(0.15, 0.45, contactBand);
     col = mix(col, bigbangCol, bigbangMix);
@@ -213,123 +142,22 @@ void main() {
 """
 
 
-class BranaColision:
-    def __init__(self, render_video=False):
-        glfw.init()
-        self.window = glfw.create_window(
-            RESOLUTION[0], RESOLUTION[1], "Brana Colision", None, None
-        )
-        glfw.make_context_current(self.window)
-
-        glViewport(0, 0, RESOLUTION[0], RESOLUTION[1])
-
-        self.shader = compileProgram(
-            compileShader(VERTEX_SHADER, GL_VERTEX_SHADER),
-            compileShader(FRAGMENT_SHADER, GL_FRAGMENT_SHADER),
-        )
-
-        vertices = np.array([-1, -1, -1, 1, 1, 1, 1, -1], dtype=np.float32)
-
-        self.vao = glGenVertexArrays(1)
-        self.vbo = glGenBuffers(1)
-
-        glBindVertexArray(self.vao)
-        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
-        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
-        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 8, ctypes.c_void_p(0))
-        glEnableVertexAttribArray(0)
-
-        self.start = time.time()
-        output_name = os.path.splitext(os.path.basename(__file__))[0] + ".mp4"
-        self.renderer = VideoRenderer(RESOLUTION[0], RESOLUTION[1], FPS, output_name)
-        if render_video:
-            self.renderer.enable()
-
-    def run(self):
-        duration = 30.0
-        frame_time = 1.0 / FPS
-        electron_gas_speed = float(
-            CONFIG.get('particles', {}).get('electron_gas_speed', 1.0)
-        )
-
-        if self.renderer.enabled:
-            total_frames = int(duration * FPS)
-            for frame in range(total_frames):
-                if glfw.window_should_close(self.window):
-                    break
-
-                t = frame * frame_time
-
-                glClearColor(0, 0, 0, 1)
-                glClear(GL_COLOR_BUFFER_BIT)
-
-                glUseProgram(self.shader)
-                glUniform1f(glGetUniformLocation(self.shader, "u_time"), t)
-                glUniform2f(
-                    glGetUniformLocation(self.shader, "u_resolution"),
-                    RESOLUTION[0],
-                    RESOLUTION[1],
-                )
-                glUniform1f(
-                    glGetUniformLocation(self.shader, "u_curvature_left"),
-                    CONFIG['branas']['curvature_left'],
-                )
-                glUniform1f(
-                    glGetUniformLocation(self.shader, "u_curvature_right"),
-                    CONFIG['branas']['curvature_right'],
-                )
-                glUniform1f(
-                    glGetUniformLocation(self.shader, "u_electron_gas_speed"),
-                    electron_gas_speed,
-                )
-
-                glBindVertexArray(self.vao)
-                glDrawArrays(GL_TRIANGLE_FAN, 0, 4)
-
-                self.renderer.capture_frame()
-
-                glfw.swap_buffers(self.window)
-                glfw.poll_events()
-
-            self.renderer.generate_video()
-        else:
-            while not glfw.window_should_close(self.window):
-                t = time.time() - self.start
-
-                if t > duration:
-                    break
-
-                glClearColor(0, 0, 0, 1)
-                glClear(GL_COLOR_BUFFER_BIT)
-
-                glUseProgram(self.shader)
-                glUniform1f(glGetUniformLocation(self.shader, "u_time"), t)
-                glUniform2f(
-                    glGetUniformLocation(self.shader, "u_resolution"),
-                    RESOLUTION[0],
-                    RESOLUTION[1],
-                )
-                glUniform1f(
-                    glGetUniformLocation(self.shader, "u_curvature_left"),
-                    CONFIG['branas']['curvature_left'],
-                )
-                glUniform1f(
-                    glGetUniformLocation(self.shader, "u_curvature_right"),
-                    CONFIG['branas']['curvature_right'],
-                )
-                glUniform1f(
-                    glGetUniformLocation(self.shader, "u_electron_gas_speed"),
-                    electron_gas_speed,
-                )
-
-                glBindVertexArray(self.vao)
-                glDrawArrays(GL_TRIANGLE_FAN, 0, 4)
-
-                glfw.swap_buffers(self.window)
-                glfw.poll_events()
-                time.sleep(frame_time)
-
-        glfw.terminate()
+class BranaColision(ShaderScene):
+    title = "Brana Colision"
+    resolution = RESOLUTION
+    fps = FPS
+    duration = 30.0
+    config = CONFIG
+    fragment_shader = FRAGMENT_SHADER
+
+    def static_uniforms(self):
+        return {
+            'u_curvature_left': self.config['branas']['curvature_left'],
+            'u_curvature_right': self.config['branas']['curvature_right'],
+            'u_electron_gas_speed': float(
+                self.config.get('particles', {}).get('electron_gas_speed', 1.0)
+            ),
+        }
 
 
 if __name__ == "__main__":
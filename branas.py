@@ -1,72 +1,62 @@
 # branas.py - Con curvatura bidireccional
-import glfw
-from OpenGL.GL import *
-from OpenGL.GL.shaders import compileProgram, compileShader
-import numpy as np
-import time
-import json
-
-with open('config/config.json', 'r') as f:
-    CONFIG = json.load(f)
+from shader_scene import ShaderScene
+from uniform_block import UniformBlock
+from config_loader import CONFIG
 
 RESOLUTION = tuple(CONFIG['render']['resolution'])
 FPS = CONFIG['render']['fps']
 
-VERTEX_SHADER = """
-#version 330 core
-layout (location = 0) in vec2 aPos;
-out vec2 vPos;
-void main() {
-    vPos = aPos;
-    gl_Position = vec4(aPos, 0.0, 1.0);
-}
-"""
+# Bloque std140 que refleja config.json uno a uno (tipo, uniform, ruta en config)
+CONFIG_BLOCK = UniformBlock('BranasConfig', [
+    ('float', 'u_collision_time', ('timing', 'collision_time')),
+
+    ('float', 'u_brana_scale', ('branas', 'scale')),
+    ('float', 'u_brana_speed', ('branas', 'speed')),
+    ('float', 'u_brana_width', ('branas', 'width')),
+    ('float', 'u_brana_core', ('branas', 'core')),
+    ('float', 'u_brana_curvature_left', ('branas', 'curvature_left')),
+    ('float', 'u_brana_curvature_right', ('branas', 'curvature_right')),
+    ('vec3', 'u_brana_left_color', ('branas', 'left_color')),
+    ('vec3', 'u_brana_right_color', ('branas', 'right_color')),
+
+    ('float', 'u_proton_size', ('particles', 'proton_size')),
+    ('float', 'u_proton_density', ('particles', 'proton_density')),
+    ('vec3', 'u_proton_color', ('particles', 'proton_color')),
+    ('float', 'u_electron_size', ('particles', 'electron_size')),
+    ('float', 'u_electron_density', ('particles', 'electron_density')),
+    ('vec3', 'u_electron_color', ('particles', 'electron_color')),
+    ('float', 'u_particle_grid', ('particles', 'grid_density')),
+    ('float', 'u_particle_brightness', ('particles', 'brightness')),
+
+    ('float', 'u_trail_decay', ('trail', 'decay')),
+    ('float', 'u_trail_intensity', ('trail', 'intensity')),
+
+    ('float', 'u_mandala_scale', ('mandala', 'scale')),
+    ('float', 'u_mandala_iterations', ('mandala', 'iterations')),
+    ('float', 'u_mandala_speed', ('mandala', 'speed')),
+    ('float', 'u_mandala_fade', ('mandala', 'fade_in')),
+
+    ('vec3', 'u_palette_a', ('palette', 'a')),
+    ('vec3', 'u_palette_b', ('palette', 'b')),
+    ('vec3', 'u_palette_c', ('palette', 'c')),
+    ('vec3', 'u_palette_d', ('palette', 'd')),
+
+    ('float', 'u_contrast', ('post', 'contrast')),
+])
 
 FRAGMENT_SHADER = """
 #version 330 core
 in vec2 vPos;
 uniform float u_time;
 uniform vec2 u_resolution;
+"""
 
-uniform float u_collision_time;
-uniform float u_brana_scale;
-uniform float u_brana_speed;
-uniform float u_brana_width;
-uniform float u_brana_core;
-uniform float u_brana_curvature_left;
-uniform float u_brana_curvature_right;
-uniform vec3 u_brana_left_color;
-uniform vec3 u_brana_right_color;
-
-uniform float u_proton_size;
-uniform float u_proton_density;
-uniform vec3 u_proton_color;
-uniform float u_electron_size;
-uniform float u_electron_density;
-uniform vec3 u_electron_color;
-uniform float u_particle_grid;
-uniform float u_particle_brightness;
-
-uniform float u_trail_decay;
-uniform float u_trail_intensity;
-
-uniform float u_mandala_scale;
-uniform float u_mandala_iterations;
-uniform float u_mandala_speed;
-uniform float u_mandala_fade;
-
-uniform vec3 u_palette_a;
-uniform vec3 u_palette_b;
-uniform vec3 u_palette_c;
-uniform vec3 u_palette_d;
-
-uniform float u_contrast;
+FRAGMENT_SHADER += CONFIG_BLOCK.declaration()
 
+FRAGMENT_SHADER += """
 out vec4 FragColor;
 
-float hash(vec2 p) {
-    return fract(sin(dot(p, vec2(127.1, 311.7))) * 43758.5453);
-}
+#include "hash.glsl"
 
 vec3 palette(float t) {
     return u_palette_a + u_palette_b * cos(6.28318 * (u_palette_c * t + u_palette_d));
@@ -163,93 +153,15 @@ void main() {
 }
 """
 
-class Intro:
-    def __init__(self):
-        glfw.init()
-        self.window = glfw.create_window(RESOLUTION[0], RESOLUTION[1], "ThöEv", None, None)
-        glfw.make_context_current(self.window)
-        
-        glViewport(0, 0, RESOLUTION[0], RESOLUTION[1])
-        
-        self.shader = compileProgram(
-            compileShader(VERTEX_SHADER, GL_VERTEX_SHADER),
-            compileShader(FRAGMENT_SHADER, GL_FRAGMENT_SHADER)
-        )
-        
-        vertices = np.array([-1,-1, -1,1, 1,1, 1,-1], dtype=np.float32)
-        
-        self.vao = glGenVertexArrays(1)
-        self.vbo = glGenBuffers(1)
-        
-        glBindVertexArray(self.vao)
-        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
-        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
-        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 8, ctypes.c_void_p(0))
-        glEnableVertexAttribArray(0)
-        
-        self.start = time.time()
-    
-    def set_uniforms(self, t):
-        glUseProgram(self.shader)
-        
-        glUniform1f(glGetUniformLocation(self.shader, "u_time"), t)
-        glUniform2f(glGetUniformLocation(self.shader, "u_resolution"), RESOLUTION[0], RESOLUTION[1])
-        
-        glUniform1f(glGetUniformLocation(self.shader, "u_collision_time"), CONFIG['timing']['collision_time'])
-        
-        glUniform1f(glGetUniformLocation(self.shader, "u_brana_scale"), CONFIG['branas']['scale'])
-        glUniform1f(glGetUniformLocation(self.shader, "u_brana_speed"), CONFIG['branas']['speed'])
-        glUniform1f(glGetUniformLocation(self.shader, "u_brana_width"), CONFIG['branas']['width'])
-        glUniform1f(glGetUniformLocation(self.shader, "u_brana_core"), CONFIG['branas']['core'])
-        glUniform1f(glGetUniformLocation(self.shader, "u_brana_curvature_left"), CONFIG['branas']['curvature_left'])
-        glUniform1f(glGetUniformLocation(self.shader, "u_brana_curvature_right"), CONFIG['branas']['curvature_right'])
-        glUniform3f(glGetUniformLocation(self.shader, "u_brana_left_color"), *CONFIG['branas']['left_color'])
-        glUniform3f(glGetUniformLocation(self.shader, "u_brana_right_color"), *CONFIG['branas']['right_color'])
-        
-        glUniform1f(glGetUniformLocation(self.shader, "u_proton_size"), CONFIG['particles']['proton_size'])
-        glUniform1f(glGetUniformLocation(self.shader, "u_proton_density"), CONFIG['particles']['proton_density'])
-        glUniform3f(glGetUniformLocation(self.shader, "u_proton_color"), *CONFIG['particles']['proton_color'])
-        glUniform1f(glGetUniformLocation(self.shader, "u_electron_size"), CONFIG['particles']['electron_size'])
-        glUniform1f(glGetUniformLocation(self.shader, "u_electron_density"), CONFIG['particles']['electron_density'])
-        glUniform3f(glGetUniformLocation(self.shader, "u_electron_color"), *CONFIG['particles']['electron_color'])
-        glUniform1f(glGetUniformLocation(self.shader, "u_particle_grid"), CONFIG['particles']['grid_density'])
-        glUniform1f(glGetUniformLocation(self.shader, "u_particle_brightness"), CONFIG['particles']['brightness'])
-        
-        glUniform1f(glGetUniformLocation(self.shader, "u_trail_decay"), CONFIG['trail']['decay'])
-        glUniform1f(glGetUniformLocation(self.shader, "u_trail_intensity"), CONFIG['trail']['intensity'])
-        
-        glUniform1f(glGetUniformLocation(self.shader, "u_mandala_scale"), CONFIG['mandala']['scale'])
-        glUniform1f(glGetUniformLocation(self.shader, "u_mandala_iterations"), CONFIG['mandala']['iterations'])
-        glUniform1f(glGetUniformLocation(self.shader, "u_mandala_speed"), CONFIG['mandala']['speed'])
-        glUniform1f(glGetUniformLocation(self.shader, "u_mandala_fade"), CONFIG['mandala']['fade_in'])
-        
-        glUniform3f(glGetUniformLocation(self.shader, "u_palette_a"), *CONFIG['palette']['a'])
-        glUniform3f(glGetUniformLocation(self.shader, "u_palette_b"), *CONFIG['palette']['b'])
-        glUniform3f(glGetUniformLocation(self.shader, "u_palette_c"), *CONFIG['palette']['c'])
-        glUniform3f(glGetUniformLocation(self.shader, "u_palette_d"), *CONFIG['palette']['d'])
-        
-        glUniform1f(glGetUniformLocation(self.shader, "u_contrast"), CONFIG['post']['contrast'])
-    
-    def run(self):
-        while not glfw.window_should_close(self.window):
-            t = time.time() - self.start
-            
-            if t > CONFIG['render']['duration']:
-                break
-            
-            glClearColor(0, 0, 0, 1)
-            glClear(GL_COLOR_BUFFER_BIT)
-            
-            self.set_uniforms(t)
-            
-            glBindVertexArray(self.vao)
-            glDrawArrays(GL_TRIANGLE_FAN, 0, 4)
-            
-            glfw.swap_buffers(self.window)
-            glfw.poll_events()
-            time.sleep(1.0/FPS)
-        
-        glfw.terminate()
+class Intro(ShaderScene):
+    title = "ThöEv"
+    resolution = RESOLUTION
+    fps = FPS
+    duration = CONFIG['render']['duration']
+    config = CONFIG
+    fragment_shader = FRAGMENT_SHADER
+    uniform_blocks = (CONFIG_BLOCK,)
+
 
 if __name__ == "__main__":
-    Intro().run()
\ No newline at end of file
+    Intro().run()
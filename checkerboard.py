@@ -0,0 +1,140 @@
+# checkerboard.py - Preview en damero con reproyección temporal (cámara fija)
+#
+#   python3 brana_proton.py --checkerboard
+#
+# Cada frame sombrea solo la mitad de los píxeles, alternando el damero:
+# el shader de la escena se dibuja en un FBO de (ancho / 2) x alto donde
+# la columna i corresponde al píxel x = 2i + ((y + paridad) & 1). Un pase
+# de resolve barato compone el frame completo con esa mitad y la otra
+# mitad del frame anterior (FBOs ping-pong). Como la cámara no se mueve la
+# reproyección es el mismo píxel, sin vectores de movimiento.
+#
+# Solo para preview en escenas que lo declaran (ShaderScene.checkerboard);
+# --mp4 siempre sombrea todos los píxeles con el shader original.
+import sys
+from OpenGL.GL import *
+from shader_library import with_defines
+from program_cache import load_program
+
+CHECKERBOARD = '--checkerboard' in sys.argv
+
+HISTORY_UNIT = 1
+CURRENT_UNIT = 2
+
+# Sustituye main() de la escena: calcula vPos del píxel del damero y la llama
+CHECKER_MAIN = """
+#undef main
+uniform int u_checker_parity;
+
+void main() {
+    ivec2 cell = ivec2(gl_FragCoord.xy);
+    float x = float(cell.x * 2 + ((cell.y + u_checker_parity) & 1)) + 0.5;
+    vPos = vec2(x, gl_FragCoord.y) / u_resolution * 2.0 - 1.0;
+    scene_main();
+}
+"""
+
+RESOLVE_SHADER = """
+#version 330 core
+uniform sampler2D u_current;
+uniform sampler2D u_history;
+uniform int u_checker_parity;
+out vec4 FragColor;
+
+void main() {
+    ivec2 pixel = ivec2(gl_FragCoord.xy);
+    if (((pixel.x + pixel.y + u_checker_parity) & 1) == 0) {
+        FragColor = texelFetch(u_current, ivec2(pixel.x >> 1, pixel.y), 0);
+    } else {
+        FragColor = texelFetch(u_history, pixel, 0);
+    }
+}
+"""
+
+
+def checker_source(fragment_source):
+    """Versión de damero de un fragment shader que lee vPos y u_resolution."""
+    if 'in vec2 vPos;' not in fragment_source:
+        raise ValueError("El shader no declara 'in vec2 vPos;', no admite --checkerboard")
+    source = fragment_source.replace('in vec2 vPos;', 'vec2 vPos;')
+    return with_defines(source, {'main': 'scene_main'}) + CHECKER_MAIN
+
+
+def color_target(width, height):
+    """(fbo, textura RGBA8) sin filtrado, leída con texelFetch."""
+    texture = glGenTextures(1)
+    glBindTexture(GL_TEXTURE_2D, texture)
+    glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA8, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, None)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+
+    fbo = glGenFramebuffers(1)
+    glBindFramebuffer(GL_FRAMEBUFFER, fbo)
+    glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, texture, 0)
+    if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+        raise RuntimeError(f"FBO de damero {width}x{height} incompleto")
+    return fbo, texture
+
+
+class CheckerboardTarget:
+    """FBO de media anchura del damero, historia ping-pong y pase de resolve."""
+
+    def __init__(self, width, height, vertex_shader, vao):
+        self.width = width
+        self.height = height
+        self.half_width = (width + 1) // 2
+        self.vao = vao
+        self.target = glGetIntegerv(GL_DRAW_FRAMEBUFFER_BINDING)
+
+        self.current = color_target(self.half_width, height)
+        self.history = [color_target(width, height), color_target(width, height)]
+        self.latest = 0
+        self.frame = 0
+        glBindFramebuffer(GL_FRAMEBUFFER, self.target)
+
+        self.resolve_program, _, _ = load_program(vertex_shader, RESOLVE_SHADER)
+        glUseProgram(self.resolve_program)
+        glUniform1i(glGetUniformLocation(self.resolve_program, 'u_current'), CURRENT_UNIT)
+        glUniform1i(glGetUniformLocation(self.resolve_program, 'u_history'), HISTORY_UNIT)
+        self.parity_location = glGetUniformLocation(self.resolve_program, 'u_checker_parity')
+
+    def parities(self):
+        """Paridades a sombrear este frame: ambas en el primero (no hay historia)."""
+        return (0, 1) if self.frame == 0 else (self.frame & 1,)
+
+    def begin(self):
+        glBindFramebuffer(GL_FRAMEBUFFER, self.current[0])
+        glViewport(0, 0, self.half_width, self.height)
+
+    def resolve(self, parity):
+        """Mitad nueva + mitad del frame anterior -> siguiente FBO de historia."""
+        write = 1 - self.latest
+        glBindFramebuffer(GL_FRAMEBUFFER, self.history[write][0])
+        glViewport(0, 0, self.width, self.height)
+
+        glUseProgram(self.resolve_program)
+        glUniform1i(self.parity_location, parity)
+        glActiveTexture(GL_TEXTURE0 + CURRENT_UNIT)
+        glBindTexture(GL_TEXTURE_2D, self.current[1])
+        glActiveTexture(GL_TEXTURE0 + HISTORY_UNIT)
+        glBindTexture(GL_TEXTURE_2D, self.history[self.latest][1])
+        glBindVertexArray(self.vao)
+        glDrawArrays(GL_TRIANGLE_FAN, 0, 4)
+        glActiveTexture(GL_TEXTURE0)
+
+        self.latest = write
+
+    def present(self):
+        """Copia el frame reconstruido al framebuffer de destino."""
+        glBindFramebuffer(GL_READ_FRAMEBUFFER, self.history[self.latest][0])
+        glBindFramebuffer(GL_DRAW_FRAMEBUFFER, self.target)
+        glBlitFramebuffer(0, 0, self.width, self.height, 0, 0, self.width, self.height,
+                          GL_COLOR_BUFFER_BIT, GL_NEAREST)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.target)
+        self.frame += 1
+
+    def release(self):
+        glDeleteProgram(self.resolve_program)
+        for fbo, texture in [self.current] + self.history:
+            glDeleteFramebuffers(1, [fbo])
+            glDeleteTextures(1, [texture])
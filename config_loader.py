@@ -0,0 +1,234 @@
+# config_loader.py - config.json compartido: esquema, valores por defecto y recarga
+#
+#   from config_loader import CONFIG
+#
+#   python3 brana_colision.py --param branas.curvature_left=-0.1
+#   python3 brana_colision.py --config otra_config.json
+#
+# El archivo se busca junto al paquete (config/config.json), no en el cwd.
+# Las claves que falten toman el valor de SCHEMA, --param ruta=valor
+# (repetible, el valor en JSON) pisa lo que diga el archivo y el resultado
+# se valida contra SCHEMA: un tipo incorrecto da ConfigError con la ruta
+# de la clave. Las claves que no están en el esquema se conservan tal cual.
+#
+# ConfigWatcher vigila el mtime del archivo; el preview de ShaderScene lo
+# consulta en cada frame y sube los uniforms del config nuevo sin
+# reiniciar (ver ShaderScene.apply_config).
+import os
+import copy
+import json
+import time
+import argparse
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Solo --config y --param; los CLI con nombres de escena heredan este parser
+CONFIG_ARGS = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+CONFIG_ARGS.add_argument('--config')
+CONFIG_ARGS.add_argument('--param', action='append', default=[])
+
+CONFIG_PATH = os.path.join(BASE_DIR, 'config', 'config.json')
+_config_option = CONFIG_ARGS.parse_known_args()[0].config
+if _config_option:
+    CONFIG_PATH = os.path.abspath(_config_option)
+
+# Clave -> (tipo, valor por defecto); los diccionarios anidados son secciones
+SCHEMA = {
+    'render': {
+        'resolution': ('size', [1920, 1080]),
+        'fps': ('int', 30),
+        'duration': ('float', 10.0),
+        'encoder': ('str', 'master'),
+    },
+    'bigbang_duration': ('float', 30.0),
+    'timing': {
+        'collision_time': ('float', 3.0),
+        'brana_travel_duration': ('float', 3.0),
+    },
+    'branas': {
+        'scale': ('float', 1.0),
+        'speed': ('float', 3.0),
+        'width': ('float', 3.0),
+        'core': ('float', 0.15),
+        'curvature_left': ('float', -0.05),
+        'curvature_right': ('float', -0.05),
+        'left_color': ('vec3', [0.3, 0.7, 1.0]),
+        'right_color': ('vec3', [1.0, 0.5, 0.2]),
+    },
+    'particles': {
+        'proton_size': ('float', 0.02),
+        'proton_density': ('float', 0.85),
+        'proton_color': ('vec3', [0.5, 0.8, 1.0]),
+        'electron_size': ('float', 0.015),
+        'electron_density': ('float', 0.88),
+        'electron_color': ('vec3', [1.0, 0.3, 0.2]),
+        'electron_gas_speed': ('float', 2.0),
+        'grid_density': ('float', 15.0),
+        'brightness': ('float', 5.0),
+    },
+    'trail': {
+        'decay': ('float', 0.8),
+        'intensity': ('float', 0.4),
+    },
+    'mandala': {
+        'scale': ('float', 3.0),
+        'iterations': ('int', 6),
+        'speed': ('float', 0.4),
+        'fade_in': ('float', 0.8),
+    },
+    'palette': {
+        'a': ('vec3', [0.5, 0.5, 0.5]),
+        'b': ('vec3', [0.5, 0.5, 0.5]),
+        'c': ('vec3', [1.0, 1.0, 1.0]),
+        'd': ('vec3', [0.263, 0.416, 0.557]),
+    },
+    'post': {
+        'contrast': ('float', 0.9),
+    },
+}
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+# Tipo del esquema -> (comprobación, descripción para el error)
+TYPES = {
+    'float': (is_number, "un número"),
+    'int': (lambda v: isinstance(v, int) and not isinstance(v, bool), "un entero"),
+    'str': (lambda v: isinstance(v, str), "un texto"),
+    'vec3': (lambda v: isinstance(v, list) and len(v) == 3 and all(map(is_number, v)),
+             "una lista de 3 números"),
+    'size': (lambda v: isinstance(v, list) and len(v) == 2
+             and all(isinstance(n, int) and n > 0 for n in v), "[ancho, alto] positivos"),
+}
+
+
+class ConfigError(ValueError):
+    """config.json ilegible o con un valor que no cumple SCHEMA."""
+
+
+def defaults(schema=SCHEMA):
+    """Config completo con los valores por defecto del esquema."""
+    return {key: defaults(spec) if isinstance(spec, dict) else copy.deepcopy(spec[1])
+            for key, spec in schema.items()}
+
+
+def merge(base, values):
+    """base con values encima, sección a sección."""
+    merged = copy.deepcopy(base)
+    for key, value in values.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def validate(config, schema=SCHEMA, prefix=""):
+    for key, spec in schema.items():
+        path = prefix + key
+        value = config[key]
+        if isinstance(spec, dict):
+            if not isinstance(value, dict):
+                raise ConfigError(f"{path}: se esperaba una sección {{...}}, no {value!r}")
+            validate(value, spec, path + ".")
+            continue
+        check, description = TYPES[spec[0]]
+        if not check(value):
+            raise ConfigError(f"{path}: se esperaba {description}, no {value!r}")
+
+
+def parse_value(text):
+    """Número, lista o booleano en JSON; si no, el texto tal cual."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def set_path(config, path, value):
+    """config['a']['b'] = value para path 'a.b'; la ruta debe existir en config.json."""
+    *parents, key = path.split('.')
+    node = config
+    for name in parents:
+        if not isinstance(node, dict) or name not in node:
+            raise ConfigError(f"{path} no existe en config/config.json")
+        node = node[name]
+    if not isinstance(node, dict) or key not in node:
+        raise ConfigError(f"{path} no existe en config/config.json")
+    node[key] = value
+
+
+def cli_overrides():
+    """{ruta: valor} de cada --param ruta=valor de la línea de comandos."""
+    overrides = {}
+    for assignment in CONFIG_ARGS.parse_known_args()[0].param:
+        path, _, value = assignment.partition('=')
+        overrides[path] = parse_value(value)
+    return overrides
+
+
+def load_config(path=None, overrides=None):
+    """Lee, completa con los defaults, aplica los --param y valida.
+
+    Cualquier fallo (archivo ilegible, JSON inválido, ruta o tipo
+    incorrectos) es ConfigError.
+    """
+    path = path or CONFIG_PATH
+    try:
+        with open(path, 'r') as f:
+            values = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ConfigError(f"{path}: JSON inválido en la línea {e.lineno}: {e.msg}") from e
+    except OSError as e:
+        # p. ej. el editor guarda con un rename atómico y el archivo falta un instante
+        raise ConfigError(f"{path}: no se pudo leer ({e.strerror or e})") from e
+    if not isinstance(values, dict):
+        raise ConfigError(f"{path}: se esperaba un objeto {{...}}, no {type(values).__name__}")
+
+    config = merge(defaults(), values)
+    for key, value in (cli_overrides() if overrides is None else overrides).items():
+        set_path(config, key, value)
+    validate(config)
+    return config
+
+
+class ConfigWatcher:
+    """Detecta cambios de config.json por mtime, como mucho cada `interval` segundos."""
+
+    def __init__(self, path=None, interval=0.25):
+        self.path = path or CONFIG_PATH
+        self.interval = interval
+        self.mtime = self.current_mtime()
+        self.checked = time.perf_counter()
+
+    def current_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def poll(self):
+        """Config nuevo si el archivo cambió y es válido; None si no.
+
+        Un archivo inválido (p. ej. guardado a medias) se reporta y se
+        sigue con el config anterior hasta el siguiente guardado.
+        """
+        now = time.perf_counter()
+        if now - self.checked < self.interval:
+            return None
+        self.checked = now
+
+        mtime = self.current_mtime()
+        if mtime is None or mtime == self.mtime:
+            return None
+        self.mtime = mtime
+        try:
+            return load_config(self.path)
+        except ConfigError as e:
+            print(f"Config no recargado: {e}")
+            return None
+
+
+CONFIG = load_config()
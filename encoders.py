@@ -0,0 +1,57 @@
+# encoders.py - Presets de codificación del video (--encoder)
+#
+#   python3 brana_colision.py --mp4 --encoder draft
+#   python3 render_parallel.py brana_colision --encoder intermediate
+#
+# draft: x264 ultrafast para iterar rápido.
+# master: x264 slow CRF 18, el de siempre (por defecto).
+# intermediate: FFV1 sin pérdida en .mkv, para recodificar o etalonar después.
+# raw: rawvideo en .nut, sin compresión (el más rápido, ~6 MB por frame a 1080p).
+#
+# El preset sale de --encoder o de render.encoder en config/config.json; la
+# extensión del archivo de salida se ajusta al contenedor del preset. Al
+# terminar, VideoRenderer imprime los fps de codificación para comparar
+# presets con el ritmo del render.
+import os
+import argparse
+
+ENCODER_PRESETS = {
+    'draft': {
+        'extension': '.mp4',
+        'args': ['-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '23', '-pix_fmt', 'yuv420p'],
+    },
+    'master': {
+        'extension': '.mp4',
+        'args': ['-c:v', 'libx264', '-preset', 'slow', '-crf', '18', '-pix_fmt', 'yuv420p'],
+    },
+    'intermediate': {
+        'extension': '.mkv',
+        # gbrp: RGB planar, sin pasar por YUV
+        'args': ['-c:v', 'ffv1', '-level', '3', '-slices', '16', '-pix_fmt', 'gbrp'],
+    },
+    'raw': {
+        'extension': '.nut',
+        'args': ['-c:v', 'rawvideo', '-pix_fmt', 'rgb24'],
+    },
+}
+
+DEFAULT_ENCODER = 'master'
+
+# Opción con valor de este módulo; los CLI con nombres de escena la heredan (render_all)
+ENCODER_ARGS = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+ENCODER_ARGS.add_argument('--encoder')
+
+ENCODER = ENCODER_ARGS.parse_known_args()[0].encoder
+
+
+def encoder_preset(config=None):
+    """Nombre del preset: --encoder, si no render.encoder del config, si no master."""
+    name = ENCODER or (config or {}).get('render', {}).get('encoder', DEFAULT_ENCODER)
+    if name not in ENCODER_PRESETS:
+        raise ValueError(f"Encoder desconocido '{name}', disponibles: {', '.join(ENCODER_PRESETS)}")
+    return name
+
+
+def output_path(path, name):
+    """path con la extensión del contenedor del preset."""
+    return os.path.splitext(path)[0] + ENCODER_PRESETS[name]['extension']
@@ -0,0 +1,58 @@
+# frame_scheduler.py - Reloj de paso fijo para el preview en tiempo real
+import time
+
+
+class FrameScheduler:
+    """Marca el ritmo del preview a `fps` con deadlines absolutos.
+
+    El tiempo de cada frame es frame_index / fps (determinista), y wait()
+    duerme solo lo que falta hasta el deadline del siguiente frame, en vez
+    de un frame_time completo después de render + swap. Si el render va
+    atrasado al menos un frame y drop_frames está activo, se saltan los
+    índices perdidos para seguir en tiempo real; sin drop_frames la
+    animación se ralentiza pero muestra todos los frames.
+    """
+
+    def __init__(self, fps, drop_frames=True, clock=time.perf_counter, sleep=time.sleep):
+        self.fps = fps
+        self.frame_time = 1.0 / fps
+        self.drop_frames = drop_frames
+        self.clock = clock
+        self.sleep = sleep
+        self.start = clock()
+        self.frame_index = 0
+        self.rendered = 0
+        self.dropped = 0
+        self.max_drift = 0.0
+
+    @property
+    def time(self):
+        """Tiempo de escena del frame actual."""
+        return self.frame_index * self.frame_time
+
+    def wait(self):
+        """Cierra el frame actual y espera el deadline del siguiente."""
+        self.rendered += 1
+        self.frame_index += 1
+
+        deadline = self.start + self.frame_index * self.frame_time
+        drift = self.clock() - deadline
+        if drift < 0:
+            self.sleep(-drift)
+            return
+
+        self.max_drift = max(self.max_drift, drift)
+        if self.drop_frames and drift >= self.frame_time:
+            skipped = int(drift / self.frame_time)
+            self.frame_index += skipped
+            self.dropped += skipped
+
+    def achieved_fps(self):
+        """Frames dibujados por segundo de reloj desde el inicio."""
+        elapsed = self.clock() - self.start
+        return self.rendered / elapsed if elapsed > 0 else 0.0
+
+    def summary(self):
+        return (f"Preview: {self.achieved_fps():.1f}/{self.fps} fps, "
+                f"{self.rendered} frames dibujados, {self.dropped} descartados, "
+                f"atraso máximo {self.max_drift * 1000.0:.1f} ms")
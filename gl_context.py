@@ -0,0 +1,135 @@
+# gl_context.py - Contexto OpenGL: ventana GLFW o headless (EGL + FBO)
+#
+# Importar este módulo ANTES que OpenGL: con --headless fija
+# PYOPENGL_PLATFORM=egl, que PyOpenGL solo lee en su primer import; por
+# eso OpenGL se importa dentro de los contextos y no a nivel de módulo.
+import os
+import sys
+import ctypes
+
+
+def use_headless_platform():
+    """Fija PyOpenGL sobre EGL; solo surte efecto antes del primer import de OpenGL."""
+    os.environ.setdefault('PYOPENGL_PLATFORM', 'egl')
+    # Mesa: sin servidor X, crear el display EGL sobre la plataforma surfaceless
+    os.environ.setdefault('EGL_PLATFORM', 'surfaceless')
+
+
+HEADLESS = '--headless' in sys.argv
+
+if HEADLESS:
+    use_headless_platform()
+
+
+class WindowContext:
+    """Ventana GLFW con su contexto OpenGL 3.3 (modo interactivo)."""
+
+    def __init__(self, width, height, title):
+        import glfw
+        self.glfw = glfw
+        glfw.init()
+        self.window = glfw.create_window(width, height, title, None, None)
+        glfw.make_context_current(self.window)
+
+    def should_close(self):
+        return self.glfw.window_should_close(self.window)
+
+    def swap_buffers(self):
+        self.glfw.swap_buffers(self.window)
+
+    def poll_events(self):
+        self.glfw.poll_events()
+
+    def terminate(self):
+        self.glfw.terminate()
+
+
+class HeadlessContext:
+    """Contexto EGL sin superficie (Mesa llvmpipe o GPU) con un FBO de render.
+
+    No necesita servidor X: el FBO queda enlazado como framebuffer de
+    dibujo y de lectura, así glReadPixels de VideoRenderer lee de él sin
+    cambios en las escenas.
+    """
+
+    def __init__(self, width, height, title):
+        from OpenGL import EGL, GL
+        self.EGL = EGL
+        self.GL = GL
+        self.width = width
+        self.height = height
+
+        self.display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        major, minor = EGL.EGLint(), EGL.EGLint()
+        if not EGL.eglInitialize(self.display, ctypes.pointer(major), ctypes.pointer(minor)):
+            raise RuntimeError("No se pudo inicializar EGL (¿Mesa instalado?)")
+
+        config_attribs = (EGL.EGLint * 11)(
+            EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+            EGL.EGL_RED_SIZE, 8,
+            EGL.EGL_GREEN_SIZE, 8,
+            EGL.EGL_BLUE_SIZE, 8,
+            EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+            EGL.EGL_NONE,
+        )
+        config = EGL.EGLConfig()
+        num_configs = EGL.EGLint()
+        EGL.eglChooseConfig(self.display, config_attribs, ctypes.pointer(config), 1,
+                            ctypes.pointer(num_configs))
+        if num_configs.value == 0:
+            raise RuntimeError("EGL no ofrece una configuración OpenGL compatible")
+
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        context_attribs = (EGL.EGLint * 7)(
+            EGL.EGL_CONTEXT_MAJOR_VERSION, 3,
+            EGL.EGL_CONTEXT_MINOR_VERSION, 3,
+            EGL.EGL_CONTEXT_OPENGL_PROFILE_MASK, EGL.EGL_CONTEXT_OPENGL_CORE_PROFILE_BIT,
+            EGL.EGL_NONE,
+        )
+        self.context = EGL.eglCreateContext(self.display, config, EGL.EGL_NO_CONTEXT,
+                                            context_attribs)
+        if self.context == EGL.EGL_NO_CONTEXT:
+            raise RuntimeError("No se pudo crear el contexto EGL OpenGL 3.3 core")
+
+        # Contexto sin superficie (EGL_KHR_surfaceless_context): se dibuja al FBO
+        EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, self.context)
+
+        self.fbo = GL.glGenFramebuffers(1)
+        self.color = GL.glGenRenderbuffers(1)
+        GL.glBindRenderbuffer(GL.GL_RENDERBUFFER, self.color)
+        GL.glRenderbufferStorage(GL.GL_RENDERBUFFER, GL.GL_RGBA8, width, height)
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self.fbo)
+        GL.glFramebufferRenderbuffer(GL.GL_FRAMEBUFFER, GL.GL_COLOR_ATTACHMENT0,
+                                     GL.GL_RENDERBUFFER, self.color)
+        if GL.glCheckFramebufferStatus(GL.GL_FRAMEBUFFER) != GL.GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError("FBO headless incompleto")
+
+        print(f"Headless: {GL.glGetString(GL.GL_RENDERER).decode()} ({width}x{height})")
+
+    def should_close(self):
+        return False
+
+    def swap_buffers(self):
+        pass
+
+    def poll_events(self):
+        pass
+
+    def terminate(self):
+        GL = self.GL
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, 0)
+        GL.glDeleteFramebuffers(1, [self.fbo])
+        GL.glDeleteRenderbuffers(1, [self.color])
+        EGL = self.EGL
+        EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+        EGL.eglDestroyContext(self.display, self.context)
+        EGL.eglTerminate(self.display)
+
+
+def create_context(width, height, title, headless=None):
+    """Crea el contexto según --headless: ventana GLFW o EGL + FBO."""
+    if headless is None:
+        headless = HEADLESS
+    if headless:
+        return HeadlessContext(width, height, title)
+    return WindowContext(width, height, title)
@@ -0,0 +1,4 @@
+// hash.glsl - Hash 2D -> [0, 1)
+float hash(vec2 p) {
+    return fract(sin(dot(p, vec2(127.1, 311.7))) * 43758.5453);
+}
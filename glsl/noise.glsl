@@ -0,0 +1,60 @@
+// noise.glsl - Value noise, fbm de 5 octavas y curl noise
+//
+// Con NOISE_TEXTURE definido (--noise-texture, ver noise_texture.py) fbm
+// y curl leen la textura precalculada u_noise en vez de evaluar el ruido.
+#include "hash.glsl"
+
+float noise(vec2 p) {
+    vec2 i = floor(p);
+    vec2 f = fract(p);
+    f = f * f * (3.0 - 2.0 * f);
+
+    float a = hash(i);
+    float b = hash(i + vec2(1.0, 0.0));
+    float c = hash(i + vec2(0.0, 1.0));
+    float d = hash(i + vec2(1.0, 1.0));
+
+    return mix(mix(a, b, f.x), mix(c, d, f.x), f.y);
+}
+
+#ifdef NOISE_TEXTURE
+uniform sampler2D u_noise;
+
+// fbm precalculado (noise_texture.py): R = fbm, GB = gradiente
+float fbm(vec2 p) {
+    return texture(u_noise, p / NOISE_PERIOD).r;
+}
+#else
+float fbm(vec2 p) {
+    float value = 0.0;
+    float amplitude = 0.5;
+    float frequency = 1.0;
+
+    for (int i = 0; i < 5; i++) {
+        value += amplitude * noise(p * frequency);
+        frequency *= 2.0;
+        amplitude *= 0.5;
+    }
+    return value;
+}
+#endif
+
+#ifdef NOISE_TEXTURE
+vec2 curl(vec2 p, float t) {
+    vec2 g = texture(u_noise, (p + t * 0.1) / NOISE_PERIOD).gb;
+    return vec2(g.x, -g.y);
+}
+#else
+vec2 curl(vec2 p, float t) {
+    float eps = 0.1;
+    float n1 = fbm(p + vec2(0.0, eps) + t * 0.1);
+    float n2 = fbm(p + vec2(0.0, -eps) + t * 0.1);
+    float n3 = fbm(p + vec2(eps, 0.0) + t * 0.1);
+    float n4 = fbm(p + vec2(-eps, 0.0) + t * 0.1);
+
+    float dx = (n1 - n2) / (2.0 * eps);
+    float dy = (n3 - n4) / (2.0 * eps);
+
+    return vec2(dy, -dx);
+}
+#endif
@@ -0,0 +1,14 @@
+// palette.glsl - Paleta coseno (Inigo Quilez)
+//
+// La fase d se puede cambiar definiendo PALETTE_D antes del #include.
+#ifndef PALETTE_D
+#define PALETTE_D vec3(0.263, 0.416, 0.557)
+#endif
+
+vec3 palette(float t) {
+    vec3 a = vec3(0.5, 0.5, 0.5);
+    vec3 b = vec3(0.5, 0.5, 0.5);
+    vec3 c = vec3(1.0, 1.0, 1.0);
+    vec3 d = PALETTE_D;
+    return a + b * cos(6.28318 * (c * t + d));
+}
@@ -0,0 +1,106 @@
+#version 330 core
+// brana_electron.py: gas con flujo y turbulencia en borde
+in vec2 vPos;
+uniform float u_time;
+uniform vec2 u_resolution;
+uniform float u_curvature;
+out vec4 FragColor;
+
+#include "../noise.glsl"
+
+// Campo de velocidad del flujo
+vec2 velocityField(vec2 p, float t) {
+    // Flujo principal de derecha a izquierda
+    vec2 mainFlow = vec2(-1.0, 0.0);
+    
+    // Perturbaciones sinusoidales
+    vec2 wave = vec2(
+        sin(p.y * 3.0 + t * 2.0) * 0.3,
+        cos(p.x * 2.0 + t * 1.5) * 0.2
+    );
+    
+    // Remolinos locales
+    vec2 vortex = curl(p * 1.5, t) * 0.4;
+    
+    return mainFlow + wave + vortex;
+}
+
+void main() {
+    vec2 uv = vPos;
+    uv.x *= u_resolution.x / u_resolution.y;
+    
+    float t = u_time * 0.5;
+    
+    // ADVECCIÓN - el gas sigue el flujo
+    vec2 flow = velocityField(uv, t);
+    vec2 uvAdvected = uv;
+    
+    // Integrar flujo hacia atrás en el tiempo (backtracing)
+    float dt = 0.05;
+    for (int i = 0; i < 3; i++) {
+        vec2 vel = velocityField(uvAdvected, t - float(i) * dt);
+        uvAdvected -= vel * dt;
+    }
+    
+    // Distorsión por curl
+    vec2 distortion = curl(uvAdvected * 2.0, t) * 0.25;
+    vec2 uvFinal = uvAdvected + distortion;
+    
+    // Turbulencia base
+    float turbulence = fbm(uvFinal * 3.0 + t * 0.3);
+    
+    // Densidad del gas
+    float density = turbulence * 0.6 + 0.3;
+    
+    // Remolinos visibles
+    float vortex = length(curl(uvFinal * 4.0, t)) * 1.5;
+    vortex = smoothstep(0.2, 0.7, vortex);
+    
+    // CORTINA CURVA
+    float duration = 3.0;
+    float aspectRatio = u_resolution.x / u_resolution.y;
+    
+    float curtainPos = aspectRatio - (u_time / duration) * (aspectRatio * 2.0);
+    float curtainCurved = curtainPos - u_curvature * uv.y * uv.y;
+    
+    // Distancia al borde de la cortina
+    float distToCurtain = abs(uv.x - curtainCurved);
+    
+    // TURBULENCIA EXTRA EN EL BORDE (inercia/fricción)
+    float edgeTurbulence = 0.0;
+    if (distToCurtain < 0.3) {
+        // Turbulencia intensa cerca del borde
+        float edgeNoise = fbm(uv * 8.0 + t * 3.0);
+        edgeTurbulence = edgeNoise * (1.0 - distToCurtain / 0.3) * 0.5;
+        
+        // Vórtices en el borde
+        vec2 edgeCurl = curl(uv * 10.0, t * 2.0);
+        edgeTurbulence += length(edgeCurl) * 0.3;
+    }
+    
+    // Color base
+    vec3 gasBlue = vec3(0.3, 0.7, 1.0);
+    vec3 glowBlue = vec3(0.5, 0.85, 1.0);
+    vec3 edgeBlue = vec3(0.7, 0.9, 1.0);
+    
+    // Mezclar colores
+    vec3 col = mix(gasBlue, glowBlue, turbulence);
+    col *= density;
+    
+    // Vórtices brillan
+    col += vec3(0.4, 0.8, 1.0) * vortex * 0.4;
+    
+    // Turbulencia en borde (más brillante)
+    col += edgeBlue * edgeTurbulence * 0.8;
+    
+    // Glow atmosférico
+    float atmosphericGlow = fbm(uvFinal * 1.5 + t * 0.2) * 0.3;
+    col += gasBlue * atmosphericGlow * 0.15;
+    
+    // Máscara
+    float visible = smoothstep(curtainCurved - 0.1, curtainCurved + 0.1, uv.x);
+    
+    vec3 finalColor = col * visible;
+    
+    FragColor = vec4(finalColor, 1.0);
+}
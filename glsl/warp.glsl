@@ -0,0 +1,17 @@
+// warp.glsl - Dominio deformado W y bumpFunc de la superficie de mercurio
+vec2 W(vec2 p, float t) {
+    p = (p + 3.0) * 4.0;
+
+    for (int i = 0; i < 3; i++) {
+        p += cos(p.yx * 3.0 + vec2(t, 1.57)) / 3.0;
+        p += sin(p.yx + t + vec2(1.57, 0.0)) / 2.0;
+        p *= 1.3;
+    }
+
+    p += fract(sin(p + vec2(13, 7)) * 5e5) * 0.03 - 0.015;
+    return mod(p, 2.0) - 1.0;
+}
+
+float bumpFunc(vec2 p, float t) {
+    return length(W(p, t)) * 0.7071;
+}
@@ -1,24 +1,9 @@
 # bigbang.py - Centrado
-import glfw
-from OpenGL.GL import *
-from OpenGL.GL.shaders import compileProgram, compileShader
-import numpy as np
-import time
-import ctypes
+from shader_scene import ShaderScene
 
 RESOLUTION = (1280, 720)
 FPS = 30
 
-VERTEX_SHADER = """
-#version 330 core
-layout (location = 0) in vec2 aPos;
-out vec2 vPos;
-void main() {
-    vPos = aPos;
-    gl_Position = vec4(aPos, 0.0, 1.0);
-}
-"""
-
 FRAGMENT_SHADER = """
 #version 330 core
 in vec2 vPos;
@@ -26,13 +11,7 @@ uniform float u_time;
 uniform vec2 u_resolution;
 out vec4 FragColor;
 
-vec3 palette(float t) {
-    vec3 a = vec3(0.5, 0.5, 0.5);
-    vec3 b = vec3(0.5, 0.5, 0.5);
-    vec3 c = vec3(1.0, 1.0, 1.0);
-    vec3 d = vec3(0.263, 0.416, 0.557);
-    return a + b * cos(6.28318 * (c * t + d));
-}
+#include "palette.glsl"
 
 void main() {
     vec2 uv = vPos * 10.0;
@@ -60,52 +39,14 @@ void main() {
 }
 """
 
-class Intro:
-    def __init__(self):
-        glfw.init()
-        self.window = glfw.create_window(RESOLUTION[0], RESOLUTION[1], "ThöEv", None, None)
-        glfw.make_context_current(self.window)
-        
-        self.shader = compileProgram(
-            compileShader(VERTEX_SHADER, GL_VERTEX_SHADER),
-            compileShader(FRAGMENT_SHADER, GL_FRAGMENT_SHADER)
-        )
-        
-        vertices = np.array([-1,-1, -1,1, 1,1, 1,-1], dtype=np.float32)
-        
-        self.vao = glGenVertexArrays(1)
-        self.vbo = glGenBuffers(1)
-        
-        glBindVertexArray(self.vao)
-        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
-        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
-        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 8, ctypes.c_void_p(0))
-        glEnableVertexAttribArray(0)
-        
-        self.start = time.time()
-    
-    def run(self):
-        while not glfw.window_should_close(self.window):
-            t = time.time() - self.start
-            
-            if t > 10.0:
-                break
-            
-            glClearColor(0, 0, 0, 1)
-            glClear(GL_COLOR_BUFFER_BIT)
-            
-            glUseProgram(self.shader)
-            glUniform1f(glGetUniformLocation(self.shader, "u_time"), t)
-            glUniform2f(glGetUniformLocation(self.shader, "u_resolution"), RESOLUTION[0], RESOLUTION[1])
-            
-            glBindVertexArray(self.vao)
-            glDrawArrays(GL_TRIANGLE_FAN, 0, 4)
-            
-            glfw.swap_buffers(self.window)
-            glfw.poll_events()
-            time.sleep(1.0/FPS)
-        
-        glfw.terminate()
+
+class Intro(ShaderScene):
+    title = "ThöEv"
+    resolution = RESOLUTION
+    fps = FPS
+    duration = 10.0
+    fragment_shader = FRAGMENT_SHADER
+
 
 if __name__ == "__main__":
     Intro().run()
@@ -0,0 +1,276 @@
+# noise_ref.py - Versión NumPy (CPU) de la librería GLSL de ruido
+#
+# Porta hash/noise/fbm/curl/W/bumpFunc/palette de los fragment shaders
+# operando sobre rejillas completas de píxeles (arrays (H, W), float32,
+# sin bucles por píxel). Sirve para imágenes de referencia y miniaturas en
+# máquinas sin GL:
+#
+#   python3 noise_ref.py proton 1.5 --size 480x270 -o proton.ppm
+#
+# Los vec2 son tuplas (x, y) de arrays y los vec3 arrays (..., 3). El
+# resultado sigue al shader dentro de la precisión de sin() en float32;
+# no es bit-exacto respecto de la GPU.
+import sys
+import argparse
+import numpy as np
+from config_loader import CONFIG, CONFIG_ARGS
+
+F32 = np.float32
+
+
+def fract(x):
+    return x - np.floor(x)
+
+
+def mix(a, b, t):
+    return a + (b - a) * t
+
+
+def smoothstep(edge0, edge1, x):
+    t = np.clip((x - edge0) / (edge1 - edge0), 0.0, 1.0)
+    return t * t * (3.0 - 2.0 * t)
+
+
+def length2(x, y):
+    return np.sqrt(x * x + y * y)
+
+
+def pixel_grid(width, height):
+    """vPos de cada píxel (centros), en orden de imagen: fila 0 arriba."""
+    x = (np.arange(width, dtype=F32) + 0.5) / width * 2.0 - 1.0
+    y = 1.0 - (np.arange(height, dtype=F32) + 0.5) / height * 2.0
+    return np.meshgrid(x, y)
+
+
+def hash2(x, y):
+    return fract(np.sin(x * F32(127.1) + y * F32(311.7)) * F32(43758.5453))
+
+
+def noise(x, y):
+    ix = np.floor(x)
+    iy = np.floor(y)
+    fx = x - ix
+    fy = y - iy
+    fx = fx * fx * (3.0 - 2.0 * fx)
+    fy = fy * fy * (3.0 - 2.0 * fy)
+
+    a = hash2(ix, iy)
+    b = hash2(ix + 1.0, iy)
+    c = hash2(ix, iy + 1.0)
+    d = hash2(ix + 1.0, iy + 1.0)
+
+    return mix(mix(a, b, fx), mix(c, d, fx), fy)
+
+
+def fbm(x, y, octaves=5):
+    value = np.zeros(np.broadcast(x, y).shape, dtype=F32)
+    amplitude = 0.5
+    frequency = 1.0
+    for _ in range(octaves):
+        value += F32(amplitude) * noise(x * F32(frequency), y * F32(frequency))
+        frequency *= 2.0
+        amplitude *= 0.5
+    return value
+
+
+def palette(t, d=(0.263, 0.416, 0.557)):
+    """Paleta coseno con a = b = 0.5, c = 1; devuelve (..., 3)."""
+    t = np.asarray(t, dtype=F32)[..., None]
+    return F32(0.5) + F32(0.5) * np.cos(F32(6.28318) * (t + np.asarray(d, dtype=F32)))
+
+
+def W(x, y, t):
+    x = (x + 3.0) * 4.0
+    y = (y + 3.0) * 4.0
+
+    for _ in range(3):
+        # Cada línea GLSL actualiza x e y a la vez con los valores previos
+        x, y = x + np.cos(y * 3.0 + t) / 3.0, y + np.cos(x * 3.0 + F32(1.57)) / 3.0
+        x, y = x + np.sin(y + t + F32(1.57)) / 2.0, y + np.sin(x + t) / 2.0
+        x = x * F32(1.3)
+        y = y * F32(1.3)
+
+    x = x + fract(np.sin(x + 13.0) * F32(5e5)) * F32(0.03) - F32(0.015)
+    y = y + fract(np.sin(y + 7.0) * F32(5e5)) * F32(0.03) - F32(0.015)
+    # mod(p, 2.0) de GLSL
+    return x - 2.0 * np.floor(x / 2.0) - 1.0, y - 2.0 * np.floor(y / 2.0) - 1.0
+
+
+def bump_func(x, y, t):
+    return length2(*W(x, y, t)) * F32(0.7071)
+
+
+def curl(x, y, t):
+    eps = F32(0.1)
+    shift = F32(t * 0.1)
+    n1 = fbm(x + shift, y + eps + shift)
+    n2 = fbm(x + shift, y - eps + shift)
+    n3 = fbm(x + eps + shift, y + shift)
+    n4 = fbm(x - eps + shift, y + shift)
+
+    dx = (n1 - n2) / (2.0 * eps)
+    dy = (n3 - n4) / (2.0 * eps)
+    return dy, -dx
+
+
+def velocity_field(x, y, t):
+    vx, vy = curl(x * 1.5, y * 1.5, t)
+    return (
+        -1.0 + np.sin(y * 3.0 + t * 2.0) * F32(0.3) + vx * F32(0.4),
+        np.cos(x * 2.0 + t * 1.5) * F32(0.2) + vy * F32(0.4),
+    )
+
+
+def vec3(*components):
+    return np.stack(np.broadcast_arrays(*components), axis=-1)
+
+
+def dot3(a, b):
+    return np.sum(a * b, axis=-1)
+
+
+def normalize3(v):
+    return v / np.sqrt(dot3(v, v))[..., None]
+
+
+def reflect3(i, n):
+    return i - 2.0 * dot3(n, i)[..., None] * n
+
+
+def render_proton(t, width, height, curvature):
+    """CPU de brana_proton.py: océano de mercurio con cortina curva."""
+    x, y = pixel_grid(width, height)
+    aspect = F32(width / height)
+    x = x * aspect
+    tm = F32(t * 0.5)
+    t = F32(t)
+
+    eps = F32(4.0 / height)
+    f = bump_func(x, y, tm)
+    fx = (bump_func(x - eps, y, tm) - f) / eps
+    fy = (bump_func(x, y - eps, tm) - f) / eps
+
+    sn = normalize3(vec3(fx * F32(0.05), fy * F32(0.05), F32(-1.0)))
+    zero = np.zeros_like(x)
+    sp = vec3(x, y, zero)
+    rd = normalize3(vec3(x, y, zero + 1.0))
+    lp = np.array([np.cos(t) * 0.5, np.sin(t) * 0.2, -1.0], dtype=F32)
+
+    ld = lp - sp
+    l_dist = np.maximum(np.sqrt(dot3(ld, ld)), F32(0.0001))
+    ld = ld / l_dist[..., None]
+
+    atten = 1.0 / (1.0 + l_dist * l_dist * F32(0.15))
+    atten = atten * (f * F32(0.9) + F32(0.1))
+
+    diff = np.maximum(dot3(sn, ld), 0.0)
+    diff = diff ** 4 * F32(0.66) + diff ** 8 * F32(0.34)
+    spec = np.maximum(dot3(reflect3(-ld, sn), -rd), 0.0) ** 12
+
+    tex_col = np.array([0.8, 0.85, 0.9], dtype=F32) * (f * F32(0.5) + F32(0.5))[..., None]
+    col = (tex_col * (diff[..., None] * np.array([1.0, 0.97, 0.92], dtype=F32) * 2.0 + 0.5)
+           + np.array([1.0, 0.9, 0.8], dtype=F32) * (spec * 2.0)[..., None]) * atten[..., None]
+
+    ref = np.maximum(dot3(reflect3(rd, sn), np.ones(3, dtype=F32)), 0.0)
+    col = col + col * (ref ** 4)[..., None] * np.array([0.4, 0.5, 0.6], dtype=F32) * 2.0
+
+    curtain_pos = -aspect + (t / 3.0) * (aspect * 2.0)
+    curtain_curved = curtain_pos + F32(curvature) * y * y
+    visible = 1.0 - smoothstep(curtain_curved - 0.1, curtain_curved + 0.1, x)
+
+    return np.sqrt(np.clip(col * visible[..., None], 0.0, 1.0))
+
+
+def render_electron(t, width, height, curvature):
+    """CPU de brana_electron.py: gas de electrones advectado por curl noise."""
+    x, y = pixel_grid(width, height)
+    aspect = F32(width / height)
+    x = x * aspect
+    u_time = F32(t)
+    t = F32(t * 0.5)
+
+    # Advección hacia atrás: 3 pasos por el campo de velocidad
+    ax, ay = x, y
+    dt = F32(0.05)
+    for i in range(3):
+        vx, vy = velocity_field(ax, ay, t - F32(i) * dt)
+        ax = ax - vx * dt
+        ay = ay - vy * dt
+
+    cx, cy = curl(ax * 2.0, ay * 2.0, t)
+    fx = ax + cx * F32(0.25)
+    fy = ay + cy * F32(0.25)
+
+    turbulence = fbm(fx * 3.0 + t * F32(0.3), fy * 3.0 + t * F32(0.3))
+    density = turbulence * F32(0.6) + F32(0.3)
+
+    vortex = length2(*curl(fx * 4.0, fy * 4.0, t)) * F32(1.5)
+    vortex = smoothstep(0.2, 0.7, vortex)
+
+    curtain_pos = aspect - (u_time / 3.0) * (aspect * 2.0)
+    curtain_curved = curtain_pos - F32(curvature) * y * y
+    dist = np.abs(x - curtain_curved)
+
+    # GLSL solo evalúa el borde si dist < 0.3; aquí se evalúa en todo y se enmascara
+    edge_noise = fbm(x * 8.0 + t * 3.0, y * 8.0 + t * 3.0)
+    edge = edge_noise * (1.0 - dist / F32(0.3)) * F32(0.5)
+    edge = edge + length2(*curl(x * 10.0, y * 10.0, t * 2.0)) * F32(0.3)
+    edge = np.where(dist < 0.3, edge, F32(0.0))
+
+    gas_blue = np.array([0.3, 0.7, 1.0], dtype=F32)
+    glow_blue = np.array([0.5, 0.85, 1.0], dtype=F32)
+    edge_blue = np.array([0.7, 0.9, 1.0], dtype=F32)
+
+    col = mix(gas_blue, glow_blue, turbulence[..., None]) * density[..., None]
+    col = col + np.array([0.4, 0.8, 1.0], dtype=F32) * (vortex * F32(0.4))[..., None]
+    col = col + edge_blue * (edge * F32(0.8))[..., None]
+    glow = fbm(fx * 1.5 + t * F32(0.2), fy * 1.5 + t * F32(0.2)) * F32(0.3)
+    col = col + gas_blue * (glow * F32(0.15))[..., None]
+
+    visible = smoothstep(curtain_curved - 0.1, curtain_curved + 0.1, x)
+    return np.clip(col * visible[..., None], 0.0, 1.0)
+
+
+# nombre -> (función, clave de curvatura en config['branas'])
+SCENES = {
+    'proton': (render_proton, 'curvature_left'),
+    'electron': (render_electron, 'curvature_right'),
+}
+
+
+def to_uint8(image):
+    """Cuantiza [0, 1] a uint8 como un framebuffer RGBA8."""
+    return np.round(np.clip(image, 0.0, 1.0) * 255.0).astype(np.uint8)
+
+
+def save_ppm(path, image):
+    height, width, _ = image.shape
+    with open(path, 'wb') as f:
+        f.write(f"P6\n{width} {height}\n255\n".encode())
+        f.write(to_uint8(image).tobytes())
+
+
+def main():
+    # --config / --param como en las escenas GPU (config_loader)
+    parser = argparse.ArgumentParser(parents=[CONFIG_ARGS], add_help=False, allow_abbrev=False)
+    parser.add_argument('--size', default='480x270')
+    parser.add_argument('-o')
+    options, rest = parser.parse_known_args()
+    args = [arg for arg in rest if not arg.startswith('-') or arg[1:2].isdigit()]
+    if len(args) < 1 or args[0] not in SCENES:
+        print("Uso: python3 noise_ref.py <proton|electron> [t] [--size WxH] [-o salida.ppm]")
+        print("       [--config archivo.json] [--param ruta=valor]")
+        sys.exit(1)
+
+    name = args[0]
+    t = float(args[1]) if len(args) > 1 else 1.5
+    width, height = (int(v) for v in options.size.split('x'))
+    output = options.o or f"{name}_{t:.2f}.ppm"
+
+    render, curvature_key = SCENES[name]
+    save_ppm(output, render(t, width, height, CONFIG['branas'][curvature_key]))
+    print(f"Imagen CPU guardada: {output} ({width}x{height}, t={t})")
+
+
+if __name__ == "__main__":
+    main()
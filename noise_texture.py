@@ -0,0 +1,133 @@
+# noise_texture.py - fbm y su gradiente precalculados en una textura que tilea
+#
+# Con --noise-texture los shaders que incluyen glsl/noise.glsl (bloques
+# #ifdef NOISE_TEXTURE) sustituyen fbm() y curl() por una lectura de
+# textura: R = fbm, G = dfbm/dx, B = dfbm/dy. La textura se hornea una vez
+# con NumPy (noise_ref) y se guarda en cache/noise/ para los siguientes
+# arranques.
+#
+# El ruido horneado es periódico (la red de enteros se envuelve con
+# módulo NOISE_PERIOD en cada octava), así que no coincide valor a valor
+# con el procedural: es el modo rápido del preview. Con --mp4/--headless
+# (y en render_all, render_parallel y render_sweep) el flag se ignora y el
+# video usa siempre el procedural; bench_noise pide la textura explícitamente.
+import os
+import sys
+import numpy as np
+from noise_ref import F32, hash2
+from shader_library import with_defines
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, 'cache', 'noise')
+
+NOISE_TEXTURE = '--noise-texture' in sys.argv
+
+NOISE_PERIOD = 16      # unidades de p que cubre la textura antes de repetirse
+NOISE_SIZE = 1024      # texels por lado: 4 por celda de la octava más fina
+NOISE_OCTAVES = 5
+NOISE_UNIT = 0         # unidad de textura del sampler u_noise
+
+
+def periodic_noise(x, y, period):
+    """Value noise de noise_ref con la red envuelta cada `period`, y su gradiente."""
+    ix = np.floor(x)
+    iy = np.floor(y)
+    fx = x - ix
+    fy = y - iy
+    ux = fx * fx * (3.0 - 2.0 * fx)
+    uy = fy * fy * (3.0 - 2.0 * fy)
+    dux = 6.0 * fx * (1.0 - fx)
+    duy = 6.0 * fy * (1.0 - fy)
+
+    x0 = np.mod(ix, period)
+    y0 = np.mod(iy, period)
+    x1 = np.mod(ix + 1.0, period)
+    y1 = np.mod(iy + 1.0, period)
+    a = hash2(x0, y0)
+    b = hash2(x1, y0)
+    c = hash2(x0, y1)
+    d = hash2(x1, y1)
+
+    k = a - b - c + d
+    value = a + (b - a) * ux + (c - a) * uy + k * ux * uy
+    grad_x = dux * ((b - a) + k * uy)
+    grad_y = duy * ((c - a) + k * ux)
+    return value, grad_x, grad_y
+
+
+def bake_fbm(period=NOISE_PERIOD, size=NOISE_SIZE, octaves=NOISE_OCTAVES):
+    """Array (size, size, 4) float32: fbm y gradiente analítico en los centros de texel."""
+    coords = (np.arange(size, dtype=F32) + 0.5) / size * period
+    x, y = np.meshgrid(coords, coords)
+
+    texture = np.zeros((size, size, 4), dtype=F32)
+    amplitude = 0.5
+    frequency = 1.0
+    for _ in range(octaves):
+        value, grad_x, grad_y = periodic_noise(x * F32(frequency), y * F32(frequency),
+                                               period * frequency)
+        texture[..., 0] += F32(amplitude) * value
+        texture[..., 1] += F32(amplitude * frequency) * grad_x
+        texture[..., 2] += F32(amplitude * frequency) * grad_y
+        frequency *= 2.0
+        amplitude *= 0.5
+    return texture
+
+
+def load_fbm(period=NOISE_PERIOD, size=NOISE_SIZE, octaves=NOISE_OCTAVES):
+    """bake_fbm con cache en disco (cache/noise/fbm_p<period>_s<size>_o<octaves>.npy)."""
+    path = os.path.join(CACHE_DIR, f"fbm_p{period}_s{size}_o{octaves}.npy")
+    if os.path.exists(path):
+        try:
+            texture = np.load(path)
+            if texture.shape == (size, size, 4) and texture.dtype == F32:
+                return texture
+        except (OSError, ValueError, EOFError):
+            pass
+        # Archivo truncado o ilegible: se vuelve a hornear y se reemplaza
+        print(f"Textura de ruido inválida en cache, se hornea de nuevo: {path}")
+
+    texture = bake_fbm(period, size, octaves)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Escritura atómica: otros procesos (render_parallel, render_sweep) pueden estar leyendo
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.save(f, texture)
+    os.replace(tmp_path, path)
+    print(f"Textura de ruido horneada: {path}")
+    return texture
+
+
+class NoiseTexture:
+    """Textura GL_RGBA32F con repetición y mipmaps creada desde load_fbm()."""
+
+    def __init__(self, period=NOISE_PERIOD, size=NOISE_SIZE):
+        from OpenGL import GL
+        self.GL = GL
+        self.period = period
+
+        data = load_fbm(period, size)
+        self.texture = GL.glGenTextures(1)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, self.texture)
+        GL.glTexImage2D(GL.GL_TEXTURE_2D, 0, GL.GL_RGBA32F, size, size, 0,
+                        GL.GL_RGBA, GL.GL_FLOAT, data)
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_S, GL.GL_REPEAT)
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_T, GL.GL_REPEAT)
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MIN_FILTER, GL.GL_LINEAR_MIPMAP_LINEAR)
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAG_FILTER, GL.GL_LINEAR)
+        GL.glGenerateMipmap(GL.GL_TEXTURE_2D)
+
+    def shader_source(self, source):
+        """Activa la rama NOISE_TEXTURE del fragment shader."""
+        return with_defines(source, {
+            'NOISE_TEXTURE': '',
+            'NOISE_PERIOD': f"{float(self.period):.1f}",
+        })
+
+    def bind(self):
+        GL = self.GL
+        GL.glActiveTexture(GL.GL_TEXTURE0 + NOISE_UNIT)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, self.texture)
+
+    def release(self):
+        self.GL.glDeleteTextures(1, [self.texture])
@@ -0,0 +1,128 @@
+# profiler.py - Tiempos por frame de cada etapa del render (--profile)
+#
+#   python3 brana_colision.py --mp4 --profile
+#   python3 brana_colision.py --mp4 --profile --profile-out perfil.json
+#
+# draw se mide en la GPU con queries GL_TIME_ELAPSED (leídas unos frames
+# después, sin bloquear) y las etapas de CPU con perf_counter: envío del
+# draw, readback, flip, write, espera de la cola del escritor y encode
+# (ffmpeg al cerrar). Cada medida va a un CSV o JSON (frame, etapa, ms) y
+# al final se imprime p50/p95/p99 por etapa.
+import sys
+import csv
+import argparse
+import json
+import time
+import ctypes
+import contextlib
+import numpy as np
+from OpenGL.GL import (
+    glGenQueries, glDeleteQueries, glBeginQuery, glEndQuery,
+    glGetQueryObjectiv, GL_TIME_ELAPSED, GL_QUERY_RESULT, GL_QUERY_RESULT_AVAILABLE,
+)
+# La versión envuelta no acepta arrays uint64 (KeyError GL_UNSIGNED_INT64_AMD): binding crudo
+from OpenGL.raw.GL.VERSION.GL_3_3 import glGetQueryObjectui64v as glGetQueryObjectui64vRaw
+
+PROFILE = '--profile' in sys.argv
+
+PROFILE_ARGS = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+PROFILE_ARGS.add_argument('--profile-out')
+
+PROFILE_OUT = PROFILE_ARGS.parse_known_args()[0].profile_out
+
+
+def query_elapsed_ns(query):
+    """Resultado de una query GL_TIME_ELAPSED en ns (espera si aún no está)."""
+    elapsed = ctypes.c_uint64()
+    glGetQueryObjectui64vRaw(query, GL_QUERY_RESULT, ctypes.byref(elapsed))
+    return elapsed.value
+
+
+class FrameProfiler:
+    """Registra (frame, etapa, segundos) de GPU y CPU durante un render."""
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self.records = []
+        self.frame = 0
+        self.free_queries = []
+        self.pending = []  # (frame, query) en orden de emisión
+
+    def add(self, stage, seconds, frame=None):
+        # list.append es atómico: el hilo escritor también registra etapas
+        self.records.append((self.frame if frame is None else frame, stage, seconds))
+
+    @contextlib.contextmanager
+    def span(self, stage, frame=None):
+        """Mide con perf_counter el bloque como una etapa de CPU."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start, frame)
+
+    def begin_gpu(self):
+        """Abre la query GL_TIME_ELAPSED del frame actual."""
+        query = self.free_queries.pop() if self.free_queries else int(glGenQueries(1)[0])
+        glBeginQuery(GL_TIME_ELAPSED, query)
+        self.pending.append((self.frame, query))
+
+    def end_gpu(self):
+        glEndQuery(GL_TIME_ELAPSED)
+        self.collect_gpu(wait=False)
+
+    def collect_gpu(self, wait):
+        """Recoge las queries terminadas (todas si wait) en orden de frame."""
+        available = np.zeros(1, dtype=np.int32)
+        while self.pending:
+            frame, query = self.pending[0]
+            if not wait:
+                glGetQueryObjectiv(query, GL_QUERY_RESULT_AVAILABLE, available)
+                if not available[0]:
+                    break
+            self.add('draw (GPU)', query_elapsed_ns(query) / 1e9, frame)
+            self.pending.pop(0)
+            self.free_queries.append(query)
+
+    def finish(self):
+        """Vacía las queries, escribe el archivo y muestra el resumen."""
+        self.collect_gpu(wait=True)
+        if self.free_queries:
+            glDeleteQueries(len(self.free_queries), self.free_queries)
+            self.free_queries = []
+        self.write()
+        print(self.summary())
+
+    def write(self):
+        rows = sorted(self.records, key=lambda record: record[0])
+        if self.output_path.endswith('.json'):
+            with open(self.output_path, 'w') as f:
+                json.dump([{'frame': frame, 'stage': stage, 'ms': seconds * 1000.0}
+                           for frame, stage, seconds in rows], f, indent=1)
+        else:
+            with open(self.output_path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['frame', 'stage', 'ms'])
+                for frame, stage, seconds in rows:
+                    writer.writerow([frame, stage, f"{seconds * 1000.0:.4f}"])
+        print(f"\nPerfil guardado: {self.output_path} ({len(rows)} medidas)")
+
+    def stage_times(self):
+        """{etapa: array de ms} en orden de primera aparición."""
+        stages = {}
+        for _, stage, seconds in self.records:
+            stages.setdefault(stage, []).append(seconds * 1000.0)
+        return {stage: np.array(values) for stage, values in stages.items()}
+
+    def summary(self):
+        lines = [f"{'Etapa':16s} {'n':>5s} {'total ms':>12s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s}"]
+        for stage, values in self.stage_times().items():
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            lines.append(f"{stage:16s} {len(values):5d} {values.sum():12.1f} "
+                         f"{p50:9.2f} {p95:9.2f} {p99:9.2f}")
+        return "\n".join(lines)
+
+
+def null_span(stage, frame=None):
+    """Sustituto de FrameProfiler.span cuando no se perfila."""
+    return contextlib.nullcontext()
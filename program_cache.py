@@ -0,0 +1,133 @@
+# program_cache.py - Cache en disco de programas GLSL enlazados (glGetProgramBinary)
+#
+# La clave es el hash del código ya preprocesado (vertex + fragment, con
+# los #include expandidos y los #define añadidos) más el driver
+# (GL_VENDOR, GL_RENDERER, GL_VERSION): un cambio de shader o de driver
+# da otra clave y se compila de nuevo. Si el driver no ofrece formatos de
+# binario o rechaza el guardado, se compila como siempre.
+#
+# --no-program-cache compila siempre (sin leer ni escribir la cache).
+# bench_startup.py compara el arranque en frío (compilar) y en caliente.
+import os
+import sys
+import time
+import hashlib
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.GL.shaders import compileShader
+from OpenGL.error import GLError
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, 'cache', 'programs')
+
+PROGRAM_CACHE = '--no-program-cache' not in sys.argv
+
+
+def driver_string():
+    return " | ".join(glGetString(name).decode() for name in (GL_VENDOR, GL_RENDERER, GL_VERSION))
+
+
+def program_key(vertex_source, fragment_source):
+    digest = hashlib.sha256()
+    for part in (vertex_source, fragment_source, driver_string()):
+        digest.update(part.encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def binary_supported():
+    return glGetIntegerv(GL_NUM_PROGRAM_BINARY_FORMATS) > 0
+
+
+def link_program(vertex_source, fragment_source):
+    """Compila y enlaza pidiendo al driver que el binario sea recuperable."""
+    program = glCreateProgram()
+    shaders = [compileShader(vertex_source, GL_VERTEX_SHADER),
+               compileShader(fragment_source, GL_FRAGMENT_SHADER)]
+    for shader in shaders:
+        glAttachShader(program, shader)
+    glProgramParameteri(program, GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL_TRUE)
+    glLinkProgram(program)
+    for shader in shaders:
+        glDetachShader(program, shader)
+        glDeleteShader(shader)
+
+    if glGetProgramiv(program, GL_LINK_STATUS) != GL_TRUE:
+        log = glGetProgramInfoLog(program)
+        glDeleteProgram(program)
+        raise RuntimeError(f"Error de enlace: {log.decode() if isinstance(log, bytes) else log}")
+    return program
+
+
+def cache_path(vertex_source, fragment_source):
+    return os.path.join(CACHE_DIR, program_key(vertex_source, fragment_source) + ".bin")
+
+
+def load_binary(path):
+    """Crea el programa desde un binario guardado; None si falta o el driver lo rechaza."""
+    try:
+        with open(path, 'rb') as f:
+            binary_format = int.from_bytes(f.read(4), 'little')
+            data = np.frombuffer(f.read(), dtype=np.uint8)
+    except OSError:
+        return None
+
+    program = glCreateProgram()
+    try:
+        glProgramBinary(program, binary_format, data, data.size)
+        linked = glGetProgramiv(program, GL_LINK_STATUS) == GL_TRUE
+    except GLError:
+        # GL_INVALID_ENUM: el driver ya no ofrece ese formato (p. ej. tras actualizarlo)
+        linked = False
+    if not linked:
+        # Binario de otro build del driver o truncado: se descarta y se recompila
+        glDeleteProgram(program)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            # Otro worker (render_parallel) lo rechazó y borró antes
+            pass
+        return None
+    return program
+
+
+def save_binary(program, path):
+    size = glGetProgramiv(program, GL_PROGRAM_BINARY_LENGTH)
+    if size <= 0:
+        return
+    length = np.zeros(1, dtype=np.int32)
+    binary_format = np.zeros(1, dtype=np.uint32)
+    data = np.zeros(size, dtype=np.uint8)
+    glGetProgramBinary(program, size, length, binary_format, data)
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Escritura atómica: otro proceso (render_parallel) puede estar leyendo
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(int(binary_format[0]).to_bytes(4, 'little'))
+        f.write(data[:length[0]].tobytes())
+    os.replace(tmp_path, path)
+
+
+def load_program(vertex_source, fragment_source, use_cache=None):
+    """Programa enlazado, desde la cache si se puede.
+
+    Devuelve (programa, origen, segundos) con origen 'cache' o 'compilado'.
+    """
+    if use_cache is None:
+        use_cache = PROGRAM_CACHE
+    start = time.perf_counter()
+
+    if not use_cache or not binary_supported():
+        program = link_program(vertex_source, fragment_source)
+        return program, 'compilado', time.perf_counter() - start
+
+    path = cache_path(vertex_source, fragment_source)
+    program = load_binary(path)
+    if program is not None:
+        return program, 'cache', time.perf_counter() - start
+
+    program = link_program(vertex_source, fragment_source)
+    elapsed = time.perf_counter() - start
+    save_binary(program, path)
+    return program, 'compilado', elapsed
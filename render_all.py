@@ -0,0 +1,117 @@
+# render_all.py - Renderiza varias escenas a MP4 en un solo proceso
+#
+#   python3 render_all.py                      # todas las escenas
+#   python3 render_all.py bigbang brana_colision --headless
+#
+# Un solo contexto GL (ventana o --headless) para todas las escenas; cada
+# escena compila su programa una vez y escribe a su propio ffmpeg. Las
+# opciones de VideoRenderer (--pbo, --ppm, --sync-writer, --encoder) aplican a todas.
+from gl_context import create_context  # antes de OpenGL (--headless)
+import sys
+import time
+import inspect
+import argparse
+import importlib
+from config_loader import CONFIG, CONFIG_ARGS
+from shader_scene import ShaderScene
+from encoders import ENCODER_ARGS
+from render_chunks import CHUNK_ARGS
+from profiler import PROFILE_ARGS
+from render_scale import SCALE_ARGS
+
+RESOLUTION = tuple(CONFIG['render']['resolution'])
+
+# nombre -> (módulo, clase ShaderScene)
+SCENES = {
+    'bigbang': ('bigbang', 'BigBang'),
+    'bigbangV2': ('bigbangV2', 'BigBangV2'),
+    'brana_colision': ('brana_colision', 'BranaColision'),
+    'brana_proton': ('brana_proton', 'Cortina'),
+    'brana_electron': ('brana_electron', 'CortinaElectron'),
+}
+
+# Opciones con valor que leen los módulos del render; cada módulo declara las suyas
+COMMON_ARGS = [CONFIG_ARGS, ENCODER_ARGS, CHUNK_ARGS, PROFILE_ARGS, SCALE_ARGS]
+
+
+def parse_scene_args(*parents, common=COMMON_ARGS):
+    """(opciones, nombres de escena) de la línea de comandos.
+
+    parents son parsers con las opciones con valor propias del CLI. Esas y
+    las de common se consumen junto con su valor; los flags sin valor
+    (--headless, --mp4...) los lee cada módulo y aquí se descartan. Lo que
+    queda son los nombres de escena.
+    """
+    parser = argparse.ArgumentParser(parents=list(common) + list(parents),
+                                     add_help=False, allow_abbrev=False)
+    options, rest = parser.parse_known_args()
+    return options, [arg for arg in rest if not arg.startswith('-')]
+
+
+def load_scene(name):
+    """Importa la clase de escena registrada con ese nombre."""
+    module_name, class_name = SCENES[name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def find_scene(name):
+    """Escena registrada o la subclase de ShaderScene de un módulo (p. ej. branas)."""
+    if name in SCENES:
+        return load_scene(name)
+    module = importlib.import_module(name)
+    for _, value in inspect.getmembers(module, inspect.isclass):
+        if issubclass(value, ShaderScene) and value.__module__ == module.__name__:
+            return value
+    raise ValueError(f"{name} no define ninguna ShaderScene")
+
+
+def render_scenes(names, context):
+    """Renderiza cada escena en el contexto dado; devuelve [(nombre, frames, segundos)]."""
+    results = []
+    for name in names:
+        scene_class = load_scene(name)
+        if tuple(scene_class.resolution) != RESOLUTION:
+            print(f"[{name}] resolución {scene_class.resolution} distinta de {RESOLUTION}, se omite.")
+            continue
+
+        print(f"\n=== {name} ===")
+        start = time.perf_counter()
+        scene = scene_class(render_video=True, context=context)
+        scene.run()
+        elapsed = time.perf_counter() - start
+        results.append((name, scene.frames_rendered, elapsed))
+    return results
+
+
+def print_report(results):
+    print("\nEscena            Frames   Tiempo      fps")
+    total_frames = 0
+    total_time = 0.0
+    for name, frames, elapsed in results:
+        fps = frames / elapsed if elapsed > 0 else 0.0
+        print(f"{name:16s} {frames:7d} {elapsed:8.1f} s {fps:8.1f}")
+        total_frames += frames
+        total_time += elapsed
+    if results:
+        print(f"{'TOTAL':16s} {total_frames:7d} {total_time:8.1f} s "
+              f"{total_frames / total_time if total_time > 0 else 0.0:8.1f}")
+
+
+def main():
+    names = parse_scene_args()[1] or list(SCENES)
+    unknown = [name for name in names if name not in SCENES]
+    if unknown:
+        print(f"Escenas desconocidas: {', '.join(unknown)}")
+        print(f"Disponibles: {', '.join(SCENES)}")
+        sys.exit(1)
+
+    context = create_context(RESOLUTION[0], RESOLUTION[1], "ThöEv - render_all")
+    try:
+        results = render_scenes(names, context)
+    finally:
+        context.terminate()
+    print_report(results)
+
+
+if __name__ == "__main__":
+    main()
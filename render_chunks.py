@@ -0,0 +1,115 @@
+# render_chunks.py - Render a video por bloques reanudables (--chunks N)
+#
+#   python3 brana_colision.py --headless --chunks 60
+#
+# Los frames se codifican en bloques de N frames (chunk_0000.mp4, ...) en
+# <salida>_chunks/, con un manifest.json que lista los bloques terminados.
+# Si el render se corta, volver a lanzar el mismo comando salta esos bloques
+# y sigue desde el primero que falte: la escena es función de
+# t = frame / fps, así que el video es el mismo que sin cortes. Con todos
+# los bloques se unen con el concat demuxer de ffmpeg (sin recodificar) y
+# se borra el directorio.
+#
+# El manifest guarda un hash del shader preprocesado y del config, la
+# resolución, los fps, el encoder y el tamaño de bloque; si algo cambió
+# desde el render anterior sus bloques se descartan.
+import os
+import json
+import argparse
+import shutil
+import hashlib
+from render_utils import concat_videos
+
+CHUNK_ARGS = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+CHUNK_ARGS.add_argument('--chunks', type=int, default=0)
+
+CHUNK_SIZE = CHUNK_ARGS.parse_known_args()[0].chunks
+
+MANIFEST = 'manifest.json'
+
+
+def chunk_dir(output_name):
+    """Directorio de bloques de una salida: brana_colision.mp4 -> brana_colision_chunks/."""
+    return os.path.splitext(output_name)[0] + '_chunks'
+
+
+def chunk_ranges(total_frames, chunk_size):
+    """[(inicio, fin)] de cada bloque; el último puede ser más corto."""
+    return [(start, min(start + chunk_size, total_frames))
+            for start in range(0, total_frames, chunk_size)]
+
+
+def render_settings(scene, chunk_size):
+    """Lo que tiene que coincidir para reutilizar bloques de un render anterior."""
+    config = json.dumps(scene.config, sort_keys=True)
+    return {
+        'shader': hashlib.sha256(scene.fragment_source.encode()).hexdigest(),
+        'config': hashlib.sha256(config.encode()).hexdigest(),
+        'resolution': [scene.width, scene.height],
+        'fps': scene.fps,
+        'frames': scene.total_frames(),
+        'chunk_size': chunk_size,
+        'encoder': scene.renderer.encoder,
+    }
+
+
+def load_manifest(directory, settings):
+    """Manifest del directorio si es del mismo render; si no, uno vacío y sin bloques."""
+    path = os.path.join(directory, MANIFEST)
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+        if manifest.get('settings') == settings:
+            return manifest
+        print(f"{directory}: el shader, el config o los parámetros cambiaron, se descartan sus bloques.")
+        shutil.rmtree(directory)
+    os.makedirs(directory, exist_ok=True)
+    return {'settings': settings, 'chunks': {}}
+
+
+def save_manifest(directory, manifest):
+    # Escritura atómica: un corte a mitad no deja un manifest ilegible
+    path = os.path.join(directory, MANIFEST)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def render_chunked(scene, chunk_size):
+    """Renderiza los bloques que falten y los une en la salida de la escena.
+
+    Devuelve True si el video final quedó generado.
+    """
+    output_name = scene.renderer.output_name
+    extension = os.path.splitext(output_name)[1]
+    directory = chunk_dir(output_name)
+    ranges = chunk_ranges(scene.total_frames(), chunk_size)
+    manifest = load_manifest(directory, render_settings(scene, chunk_size))
+    chunks = manifest['chunks']
+
+    def finished(index):
+        entry = chunks.get(str(index))
+        return entry is not None and os.path.exists(os.path.join(directory, entry['file']))
+
+    pending = [index for index in range(len(ranges)) if not finished(index)]
+    print(f"{output_name}: {len(ranges)} bloques de {chunk_size} frames, "
+          f"{len(ranges) - len(pending)} ya terminados en {directory}/")
+
+    for index in pending:
+        start, stop = ranges[index]
+        name = f"chunk_{index:04d}{extension}"
+        scene.renderer = scene.make_renderer(os.path.join(directory, name))
+        scene.renderer.enable()
+        if not scene.render_frames(start, stop) or scene.renderer.frame_count != stop - start:
+            print(f"Bloque {index} (frames {start}-{stop - 1}) incompleto; "
+                  f"vuelve a lanzar el comando para seguir desde él.")
+            return False
+        chunks[str(index)] = {'file': name, 'frames': stop - start}
+        save_manifest(directory, manifest)
+
+    paths = [os.path.join(directory, chunks[str(index)]['file']) for index in range(len(ranges))]
+    if not concat_videos(paths, output_name):
+        return False
+    shutil.rmtree(directory)
+    return True
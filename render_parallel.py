@@ -0,0 +1,98 @@
+# render_parallel.py - Render de una escena repartido en varios procesos
+#
+#   python3 render_parallel.py brana_colision [--workers N] [--encoder draft]
+#
+# Las escenas son funciones puras de u_time (t = frame / fps), así que los
+# frames se reparten en rangos contiguos: cada worker abre su propio
+# contexto headless (EGL), codifica su segmento y al final los segmentos
+# se unen con el concat demuxer de ffmpeg sin recodificar.
+import gl_context
+gl_context.use_headless_platform()  # los workers nunca abren ventana
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import multiprocessing
+from render_all import SCENES, load_scene, parse_scene_args
+from render_utils import concat_videos
+from encoders import encoder_preset, output_path
+
+
+def split_frames(total_frames, workers):
+    """Reparte [0, total_frames) en `workers` rangos contiguos casi iguales."""
+    bounds = [total_frames * i // workers for i in range(workers + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(workers) if bounds[i] < bounds[i + 1]]
+
+
+def render_segment(scene_name, start, stop, output_name, threads):
+    """Worker: renderiza los frames [start, stop) de la escena a output_name."""
+    # llvmpipe crea un hilo por núcleo; con N workers se reparte entre ellos
+    os.environ.setdefault('LP_NUM_THREADS', str(threads))
+
+    scene_class = load_scene(scene_name)
+    context = gl_context.create_context(*scene_class.resolution, scene_class.title, headless=True)
+    begin = time.perf_counter()
+    # Cada segmento ya es un bloque: sin --chunks dentro del worker
+    scene = scene_class(render_video=True, context=context, output_name=output_name, chunk_size=0)
+    scene.render_frames(start, stop)
+    scene.finish_profile()
+    frames = scene.renderer.frame_count
+    scene.release()
+    context.terminate()
+    return frames, time.perf_counter() - begin
+
+
+def render_parallel(scene_name, workers):
+    scene_class = load_scene(scene_name)
+    total_frames = int(scene_class.duration * scene_class.fps)
+    ranges = split_frames(total_frames, workers)
+    # Segmentos y salida en el contenedor del preset (los workers eligen el mismo)
+    encoder = encoder_preset(scene_class.config)
+    output_name = output_path(scene_class.output_name or f"{scene_name}.mp4", encoder)
+    threads = max(1, (os.cpu_count() or 1) // len(ranges))
+
+    segment_dir = tempfile.mkdtemp(prefix="segments_")
+    segments = [output_path(os.path.join(segment_dir, f"segment_{i:03d}.mp4"), encoder)
+                for i in range(len(ranges))]
+    print(f"{scene_name}: {total_frames} frames en {len(ranges)} workers -> {output_name}")
+
+    start = time.perf_counter()
+    try:
+        # spawn: cada worker arranca limpio y crea su propio contexto EGL
+        with multiprocessing.get_context('spawn').Pool(len(ranges)) as pool:
+            results = pool.starmap(render_segment, [
+                (scene_name, first, last, path, threads)
+                for (first, last), path in zip(ranges, segments)
+            ])
+
+        frames = sum(count for count, _ in results)
+        if frames != total_frames:
+            print(f"Faltan frames: {frames}/{total_frames}, no se unen los segmentos.")
+            return False
+        ok = concat_videos(segments, output_name)
+    finally:
+        shutil.rmtree(segment_dir)
+
+    elapsed = time.perf_counter() - start
+    print(f"{frames} frames en {elapsed:.1f} s ({frames / elapsed:.1f} fps)")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    options, names = parse_scene_args(parser)
+    if len(names) != 1 or names[0] not in SCENES:
+        print("Uso: python3 render_parallel.py <escena> [--workers N] [--encoder PRESET]")
+        print(f"Escenas: {', '.join(SCENES)}")
+        sys.exit(1)
+
+    if not render_parallel(names[0], options.workers):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
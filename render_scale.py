@@ -0,0 +1,110 @@
+# render_scale.py - Preview a resolución reducida con reescalado al framebuffer
+#
+#   python3 brana_electron.py --scale 0.5
+#   python3 brana_electron.py --adaptive-scale
+#
+# El shader se dibuja en un FBO de (ancho * escala, alto * escala) y se
+# copia al framebuffer de la ventana con glBlitFramebuffer (filtro
+# bilineal). u_resolution no cambia: los shaders solo lo usan para el
+# aspecto y el paso del bump, así la imagen es la misma con menos
+# muestras. Solo afecta al preview; --mp4 renderiza siempre a escala 1.
+import sys
+import argparse
+from OpenGL.GL import *
+
+MIN_SCALE = 0.25
+MAX_SCALE = 1.0
+SCALE_STEP = 0.05  # el FBO solo se recrea cuando la escala cambia un paso
+
+
+def clamp_scale(scale):
+    scale = round(scale / SCALE_STEP) * SCALE_STEP
+    return min(MAX_SCALE, max(MIN_SCALE, scale))
+
+
+SCALE_ARGS = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+SCALE_ARGS.add_argument('--scale', type=float, default=MAX_SCALE)
+
+RENDER_SCALE = clamp_scale(SCALE_ARGS.parse_known_args()[0].scale)
+
+ADAPTIVE_SCALE = '--adaptive-scale' in sys.argv
+
+
+class ScaledTarget:
+    """FBO de color a resolución reducida que se reescala al framebuffer actual."""
+
+    def __init__(self, width, height, scale):
+        self.width = width
+        self.height = height
+        # Framebuffer de destino: 0 con ventana, el FBO del contexto headless si no
+        self.target = glGetIntegerv(GL_DRAW_FRAMEBUFFER_BINDING)
+        self.fbo = glGenFramebuffers(1)
+        self.color = glGenRenderbuffers(1)
+        self.scale = None
+        self.resize(scale)
+
+    def resize(self, scale):
+        if scale == self.scale:
+            return
+        self.scale = scale
+        self.scaled_width = max(1, int(self.width * scale))
+        self.scaled_height = max(1, int(self.height * scale))
+
+        glBindRenderbuffer(GL_RENDERBUFFER, self.color)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RGBA8, self.scaled_width, self.scaled_height)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, self.color)
+        if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError(f"FBO de escala {scale:.2f} incompleto")
+        glBindFramebuffer(GL_FRAMEBUFFER, self.target)
+
+    def begin(self):
+        """Redirige el dibujo al FBO reducido."""
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glViewport(0, 0, self.scaled_width, self.scaled_height)
+
+    def end(self):
+        """Reescala el FBO al framebuffer de destino y lo deja enlazado."""
+        glBindFramebuffer(GL_READ_FRAMEBUFFER, self.fbo)
+        glBindFramebuffer(GL_DRAW_FRAMEBUFFER, self.target)
+        glBlitFramebuffer(0, 0, self.scaled_width, self.scaled_height,
+                          0, 0, self.width, self.height,
+                          GL_COLOR_BUFFER_BIT, GL_LINEAR)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.target)
+        glViewport(0, 0, self.width, self.height)
+
+    def release(self):
+        glDeleteFramebuffers(1, [self.fbo])
+        glDeleteRenderbuffers(1, [self.color])
+
+
+class AdaptiveScale:
+    """Ajusta la escala para mantener `fps` según el tiempo medido de cada frame.
+
+    Usa una media exponencial del tiempo de frame (dibujo + blit + swap) y
+    cada `interval` frames baja un paso si supera el presupuesto o sube
+    uno si sobra margen, con histéresis para no oscilar.
+    """
+
+    def __init__(self, fps, scale=MAX_SCALE, interval=10, smoothing=0.2):
+        self.budget = 1.0 / fps
+        self.scale = clamp_scale(scale)
+        self.interval = interval
+        self.smoothing = smoothing
+        self.average = None
+        self.frames = 0
+
+    def update(self, frame_seconds):
+        """Registra un frame y devuelve la escala a usar en el siguiente."""
+        if self.average is None:
+            self.average = frame_seconds
+        else:
+            self.average += self.smoothing * (frame_seconds - self.average)
+
+        self.frames += 1
+        if self.frames % self.interval == 0:
+            if self.average > self.budget:
+                self.scale = clamp_scale(self.scale - SCALE_STEP)
+            elif self.average < self.budget * 0.7:
+                self.scale = clamp_scale(self.scale + SCALE_STEP)
+        return self.scale
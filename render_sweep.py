@@ -0,0 +1,278 @@
+# render_sweep.py - Barrido de parámetros de config.json en varios procesos
+#
+#   python3 render_sweep.py brana_colision --set branas.curvature_left=-0.1,0.0,0.1 \
+#       --set particles.electron_gas_speed=1,2 [--seconds 2] [--scale 0.25]
+#   python3 render_sweep.py branas --sweep sweep.json [--workers N] [--samples 4]
+#
+# Cada variante es el config.json con algunas rutas cambiadas. Con --set
+# (valores escalares separados por coma) o con "grid" en el archivo de
+# --sweep se toma el producto cartesiano; "variants" en el archivo añade
+# una lista explícita de cambios (útil para vec3, p. ej. palette.d):
+#
+#   {"grid": {"timing.collision_time": [2.0, 3.0]},
+#    "variants": [{"palette.d": [0.0, 0.33, 0.67]}, {"palette.d": [0.263, 0.416, 0.557]}]}
+#
+# Las variantes se reparten entre procesos headless (EGL). Cada proceso
+# compila el programa una sola vez y para cada variante solo vuelve a
+# subir los uniforms estáticos (static_uniforms y bloques del config).
+# Cada variante renderiza los primeros --seconds a escala --scale en un
+# clip (encoder draft salvo --encoder). En sweeps/<escena>/ quedan
+# también contact.ppm (una fila por variante, --samples instantes por
+# fila) e index.json, que relaciona cada fila con sus cambios.
+#
+# Las rutas tienen que ser claves de SCHEMA (config_loader.py); render.*
+# no se barre. Antes de renderizar se avisa de las claves que la escena no
+# usa (no cambian ningún uniform: p. ej. bigbang_duration, que se lee al
+# importar, o palette.* en escenas con la paleta fija en el GLSL), porque
+# sus variantes darían el mismo video.
+import gl_context
+gl_context.use_headless_platform()  # los workers nunca abren ventana
+
+import os
+import sys
+import copy
+import json
+import time
+import argparse
+import itertools
+import multiprocessing
+import numpy as np
+from OpenGL.GL import glReadPixels, glPixelStorei, GL_RGB, GL_UNSIGNED_BYTE, GL_PACK_ALIGNMENT
+from render_all import SCENES, COMMON_ARGS, find_scene, parse_scene_args
+from config_loader import CONFIG, SCHEMA, ConfigError, parse_value, set_path, validate
+from render_scale import SCALE_ARGS
+from encoders import ENCODER, encoder_preset, output_path
+
+SHEET_GAP = 4  # píxeles negros entre miniaturas
+
+
+def expand_sweep(grid, variants):
+    """[{ruta: valor}]: producto cartesiano de grid combinado con cada entrada de variants."""
+    combos = [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+    return [dict(combo, **variant) for combo in combos for variant in (variants or [{}])]
+
+
+def check_keys(paths):
+    """Cada ruta barrida debe ser una clave (no una sección) de SCHEMA, salvo render.*."""
+    for path in paths:
+        if path.split('.')[0] == 'render':
+            raise ConfigError(f"{path}: render.* no se barre (tamaño y duración salen de "
+                              f"--scale y --seconds, el encoder de --encoder)")
+        node = SCHEMA
+        for key in path.split('.'):
+            if not isinstance(node, dict) or key not in node:
+                raise ConfigError(f"{path} no es una clave de config.json (ver SCHEMA en config_loader.py)")
+            node = node[key]
+        if isinstance(node, dict):
+            raise ConfigError(f"{path} es una sección: se barren sus claves, p. ej. {path}.{next(iter(node))}")
+
+
+def scene_inputs(scene_class, config, times):
+    """Lo que el worker toma del config: uniforms estáticos, bloques y uniforms de cada frame.
+
+    Los valores que una escena lee de CONFIG al importarse (p. ej.
+    bigbang_duration) o que están fijos en el GLSL no aparecen aquí.
+    """
+    scene = scene_class.__new__(scene_class)  # sin contexto GL: solo se leen uniforms
+    scene.config = config
+    scene.width, scene.height = scene_class.resolution
+    inputs = [sorted(scene.static_uniforms().items())]
+    inputs += [block.pack(config).tolist() for block in scene_class.uniform_blocks]
+    inputs += [sorted(scene.frame_uniforms(t).items()) for t in times]
+    return inputs
+
+
+def unused_keys(scene_class, base_config, overrides, times):
+    """Rutas barridas que, cambiadas solas, no cambian nada de scene_inputs."""
+    values = {}
+    for variant in overrides:
+        for path, value in variant.items():
+            values.setdefault(path, []).append(value)
+    reference = scene_inputs(scene_class, base_config, times)
+    return [path for path, options in values.items()
+            if all(scene_inputs(scene_class, variant_config(base_config, {path: value}), times) == reference
+                   for value in options)]
+
+
+def variant_config(base, overrides):
+    config = copy.deepcopy(base)
+    for path, value in overrides.items():
+        set_path(config, path, value)
+    return config
+
+
+def scaled_resolution(resolution, scale):
+    """Resolución reducida con lados pares (yuv420p los necesita)."""
+    return tuple(max(2, int(side * scale) // 2 * 2) for side in resolution)
+
+
+def read_frame(scene, t):
+    """Dibuja t y devuelve la imagen (alto, ancho, 3) con la fila 0 arriba."""
+    scene.draw(t)
+    glPixelStorei(GL_PACK_ALIGNMENT, 1)
+    pixels = glReadPixels(0, 0, scene.width, scene.height, GL_RGB, GL_UNSIGNED_BYTE)
+    image = np.frombuffer(pixels, dtype=np.uint8).reshape(scene.height, scene.width, 3)
+    return np.flipud(image).copy()
+
+
+def render_variants(scene_name, jobs, resolution, frames, sample_times, threads):
+    """Worker: renderiza cada (índice, config, clip) de jobs con un único programa."""
+    os.environ.setdefault('LP_NUM_THREADS', str(threads))
+
+    base = find_scene(scene_name)
+    scene_class = type(f"{base.__name__}Sweep", (base,), {'resolution': resolution})
+    context = gl_context.create_context(*resolution, base.title, headless=True)
+    # Los clips son video: ruido procedural aunque se pase --noise-texture
+    scene = scene_class(context=context, noise_texture=False)
+
+    results = []
+    for index, config, clip_path in jobs:
+        begin = time.perf_counter()
+        # Mismo programa: solo cambian los uniforms que salen del config
+        scene.config = config
+        scene.upload_static_uniforms()
+        scene.renderer = scene.make_renderer(clip_path)
+        scene.renderer.enable()
+        scene.render_frames(0, frames)
+        thumbnails = [read_frame(scene, t) for t in sample_times]
+        results.append((index, scene.renderer.frame_count, time.perf_counter() - begin, thumbnails))
+
+    scene.release()
+    context.terminate()
+    return results
+
+
+def contact_sheet(rows):
+    """Une las miniaturas: una fila por variante, una columna por instante."""
+    height, width, _ = rows[0][0].shape
+    columns = len(rows[0])
+    sheet = np.zeros((len(rows) * (height + SHEET_GAP) - SHEET_GAP,
+                      columns * (width + SHEET_GAP) - SHEET_GAP, 3), dtype=np.uint8)
+    for row, thumbnails in enumerate(rows):
+        for column, image in enumerate(thumbnails):
+            y = row * (height + SHEET_GAP)
+            x = column * (width + SHEET_GAP)
+            sheet[y:y + height, x:x + width] = image
+    return sheet
+
+
+def save_ppm(path, image):
+    height, width, _ = image.shape
+    with open(path, 'wb') as f:
+        f.write(f"P6\n{width} {height}\n255\n".encode())
+        f.write(image.tobytes())
+
+
+def render_sweep(scene_name, overrides, seconds, scale, samples, workers, out_dir):
+    base = find_scene(scene_name)
+    resolution = scaled_resolution(base.resolution, scale)
+    frames = min(int(base.duration * base.fps), int(seconds * base.fps))
+    sample_times = [frame / base.fps for frame in np.linspace(0, frames - 1, samples).astype(int)]
+
+    base_config = copy.deepcopy(base.config or CONFIG)
+    if ENCODER is None:
+        # Clips de revisión: draft salvo que se pida otro preset
+        base_config.setdefault('render', {})['encoder'] = 'draft'
+    encoder = encoder_preset(base_config)
+
+    check_keys({path for variant in overrides for path in variant})
+    configs = [variant_config(base_config, variant) for variant in overrides]
+    for config in configs:
+        validate(config)
+    unused = unused_keys(base, base_config, overrides, [frame / base.fps for frame in range(frames)])
+    for path in unused:
+        print(f"Aviso: {scene_name} no usa {path} (no cambia ningún uniform); "
+              f"las variantes que solo difieren en esa clave darán el mismo video")
+
+    os.makedirs(out_dir, exist_ok=True)
+    clips = [output_path(os.path.join(out_dir, f"variant_{index:03d}.mp4"), encoder)
+             for index in range(len(configs))]
+
+    workers = max(1, min(workers, len(configs)))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    jobs = [(index, config, clip) for index, (config, clip) in enumerate(zip(configs, clips))]
+    print(f"{scene_name}: {len(configs)} variantes de {frames} frames a "
+          f"{resolution[0]}x{resolution[1]} en {workers} workers -> {out_dir}/")
+
+    start = time.perf_counter()
+    # spawn: cada worker arranca limpio y crea su propio contexto EGL
+    with multiprocessing.get_context('spawn').Pool(workers) as pool:
+        batches = pool.starmap(render_variants, [
+            (scene_name, jobs[worker::workers], resolution, frames, sample_times, threads)
+            for worker in range(workers)
+        ])
+    results = sorted(result for batch in batches for result in batch)
+    elapsed = time.perf_counter() - start
+
+    save_ppm(os.path.join(out_dir, 'contact.ppm'), contact_sheet([r[3] for r in results]))
+    index = {
+        'scene': scene_name,
+        'resolution': list(resolution),
+        'frames': frames,
+        'sample_times': sample_times,
+        'unused_keys': unused,
+        'variants': [{'row': row, 'overrides': overrides[row], 'clip': os.path.basename(clips[row]),
+                      'frames': count, 'seconds': round(seconds_taken, 3)}
+                     for row, count, seconds_taken, _ in results],
+    }
+    with open(os.path.join(out_dir, 'index.json'), 'w') as f:
+        json.dump(index, f, indent=1)
+
+    print(f"\n{'Fila':>4s}  {'Frames':>6s} {'Tiempo':>8s}  Cambios")
+    for row, count, seconds_taken, _ in results:
+        changes = ", ".join(f"{path}={value}" for path, value in overrides[row].items()) or "(base)"
+        print(f"{row:4d}  {count:6d} {seconds_taken:6.1f} s  {changes}")
+    total = sum(count for _, count, _, _ in results)
+    print(f"\n{total} frames en {elapsed:.1f} s ({total / elapsed:.1f} fps); "
+          f"contact.ppm e index.json en {out_dir}/")
+    return all(count == frames for _, count, _, _ in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    parser.add_argument('--set', action='append', default=[])
+    parser.add_argument('--sweep')
+    parser.add_argument('--seconds', type=float, default=2.0)
+    # --scale del sweep (tamaño de los clips), no la escala de preview de render_scale
+    parser.add_argument('--scale', type=float, default=0.25)
+    parser.add_argument('--samples', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--out')
+    common = [args for args in COMMON_ARGS if args is not SCALE_ARGS]
+    options, names = parse_scene_args(parser, common=common)
+    if len(names) != 1:
+        print("Uso: python3 render_sweep.py <escena|módulo> [--set ruta=v1,v2 ...] [--sweep archivo.json]")
+        print("       [--seconds 2] [--scale 0.25] [--samples 4] [--workers N] [--out dir] [--encoder PRESET]")
+        print(f"Escenas: {', '.join(SCENES)}")
+        sys.exit(1)
+
+    grid = {}
+    variants = []
+    if options.sweep:
+        with open(options.sweep, 'r') as f:
+            sweep = json.load(f)
+        grid.update(sweep.get('grid', {}))
+        variants = sweep.get('variants', [])
+    for assignment in options.set:
+        path, _, values = assignment.partition('=')
+        grid[path] = [parse_value(value) for value in values.split(',')]
+
+    overrides = expand_sweep(grid, variants)
+    try:
+        ok = render_sweep(
+            names[0], overrides,
+            seconds=options.seconds,
+            scale=options.scale,
+            samples=options.samples,
+            workers=options.workers,
+            out_dir=options.out or os.path.join('sweeps', names[0]),
+        )
+    except ConfigError as e:
+        print(f"Sweep inválido: {e}")
+        sys.exit(1)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,323 @@
 # render_utils.py - Utilidades para renderizar a video
 import os
+import sys
 import subprocess
 import tempfile
 import shutil
-from OpenGL.GL import glReadPixels, GL_RGB, GL_UNSIGNED_BYTE
+import time
+import ctypes
+import queue
+import threading
+import contextlib
+from OpenGL.GL import (
+    glReadPixels, glPixelStorei, glGenBuffers, glBindBuffer, glBufferData,
+    glMapBuffer, glUnmapBuffer, glDeleteBuffers,
+    GL_RGB, GL_UNSIGNED_BYTE, GL_PACK_ALIGNMENT, GL_PIXEL_PACK_BUFFER,
+    GL_STREAM_READ, GL_READ_ONLY,
+)
+from OpenGL.raw.GL.VERSION.GL_1_0 import glReadPixels as glReadPixelsRaw
 import numpy as np
+from encoders import ENCODER_PRESETS, encoder_preset, output_path
+
+# Tamaño del anillo de PBOs con --pbo (frame N se mapea en el frame N+2)
+DEFAULT_PBO_COUNT = 3
+
+# Frames en vuelo entre el hilo de render y el escritor (~6 MB c/u a 1080p)
+DEFAULT_QUEUE_SIZE = 8
+
+# Marcador en la cola del escritor: repetir el último frame escrito
+DUPLICATE_FRAME = object()
 
 class VideoRenderer:
-    """Clase para capturar frames y generar video MP4."""
+    """Clase para capturar frames y generar video MP4.
+
+    Por defecto los frames se envían crudos (rgb24) al stdin de un proceso
+    ffmpeg abierto en enable(), de modo que la codificación ocurre en paralelo
+    al render y no se usa disco temporal. En ese modo el volteo vertical lo
+    hace ffmpeg (filtro vflip) y el buffer de glReadPixels se escribe tal
+    cual vía memoryview, sin copias intermedias en Python. Con stream=False
+    (o --ppm en la línea de comandos, o si ffmpeg no está en el PATH) se usa
+    el modo antiguo: un PPM volteado por frame y ffmpeg al final. El codec
+    y el contenedor salen del preset `encoder` (ver encoders.py).
+
+    Con pbo_count >= 2 (o --pbo) la lectura usa un anillo de pixel buffer
+    objects: glReadPixels del frame N es asíncrono y se mapea el buffer del
+    frame más antiguo pendiente, así la GPU y la copia en CPU se solapan.
+    Los frames pendientes se vacían en generate_video(), por lo que el orden
+    y la cantidad de frames son los mismos que en el modo síncrono.
+
+    La escritura (y el volteo en modo PPM) ocurre en un hilo escritor que
+    consume una cola acotada (queue_size frames). Si el escritor se atrasa,
+    capture_frame() se bloquea en vez de acumular memoria; generate_video()
+    espera a que la cola se vacíe antes de cerrar el video. Con
+    threaded=False (o --sync-writer) todo corre en el hilo de render.
+
+    duplicate_frame() repite el último frame capturado sin dibujar ni leer
+    de la GPU: el escritor recibe un marcador y vuelve a enviar los mismos
+    bytes a ffmpeg (o enlaza el PPM anterior). Con PBOs la repetición se
+    entrega justo después de su frame al mapearlo.
+    """
 
-    def __init__(self, width, height, fps, output_name):
+    def __init__(self, width, height, fps, output_name, stream=None, pbo_count=None,
+                 threaded=None, queue_size=DEFAULT_QUEUE_SIZE, encoder=None):
         self.width = width
         self.height = height
         self.fps = fps
-        self.output_name = output_name
-        self.frame_dir = tempfile.mkdtemp(prefix="frames_")
+        self.encoder = encoder or encoder_preset()
+        self.output_name = output_path(output_name, self.encoder)
+        if stream is None:
+            stream = '--ppm' not in sys.argv
+        self.stream = stream
+        if pbo_count is None:
+            pbo_count = DEFAULT_PBO_COUNT if '--pbo' in sys.argv else 0
+        if pbo_count == 1:
+            raise ValueError("pbo_count debe ser 0 (síncrono) o >= 2")
+        self.pbo_count = pbo_count
+        self.pbos = []
+        self.pbo_issued = 0
+        self.pbo_repeats = {}  # índice de frame en el anillo -> repeticiones pendientes
+        self.frame_size = width * height * 3
+        if threaded is None:
+            threaded = '--sync-writer' not in sys.argv
+        self.threaded = threaded
+        self.queue_size = queue_size
+        self.frame_queue = None
+        self.writer = None
+        self.writer_error = None  # excepción que detuvo al hilo escritor
+        self.frame_dir = None
+        self.process = None
+        self.ffmpeg_log = None
         self.frame_count = 0
+        self.encode_start = None
+        self.encode_fps = None
+        self.last_pixels = None
+        self.last_frame_path = None
         self.enabled = False
+        # FrameProfiler (--profile) que asigna la escena; None = sin medir
+        self.profiler = None
+
+    def _span(self, stage, frame=None):
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.span(stage, frame)
+
+    def _encoder_args(self, flip=False):
+        """Argumentos de codificación comunes a ambos modos."""
+        # OpenGL entrega las filas de abajo hacia arriba
+        filters = ['-vf', 'vflip'] if flip else []
+        return filters + ENCODER_PRESETS[self.encoder]['args'] + [self.output_name]
 
     def enable(self):
         """Activa la captura de frames."""
         self.enabled = True
-        print(f"Renderizando a: {self.output_name}")
-        print(f"Frames temporales en: {self.frame_dir}")
+        print(f"Renderizando a: {self.output_name} (encoder {self.encoder})")
+
+        if self.stream and shutil.which('ffmpeg') is None:
+            print("ffmpeg no encontrado en el PATH, usando frames PPM.")
+            self.stream = False
+
+        if self.stream:
+            self._open_stream()
+            print("Frames enviados directamente a ffmpeg (sin disco temporal).")
+        else:
+            self.frame_dir = tempfile.mkdtemp(prefix="frames_")
+            print(f"Frames temporales en: {self.frame_dir}")
+
+        # Filas sin padding: el buffer mide exactamente width * height * 3
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        if self.pbo_count:
+            self._create_pbos()
+            print(f"Lectura asíncrona con {self.pbo_count} PBOs.")
+        if self.threaded:
+            self._start_writer()
+
+    def _start_writer(self):
+        """Arranca el hilo que voltea y escribe los frames encolados."""
+        self.frame_queue = queue.Queue(maxsize=self.queue_size)
+        self.writer = threading.Thread(target=self._writer_loop, name="frame-writer", daemon=True)
+        self.writer.start()
+
+    def _writer_loop(self):
+        while True:
+            pixels = self.frame_queue.get()
+            if pixels is None:
+                break
+            # Si la escritura falla se siguen consumiendo frames para no bloquear el render
+            if not self.enabled:
+                continue
+            try:
+                self._write_frame(pixels)
+            except Exception as e:
+                # Cualquier error (no solo OSError): el render lo ve en capture_frame
+                print(f"Error escribiendo frame {self.frame_count}: {e!r}")
+                self.writer_error = e
+                self.enabled = False
+
+    def _raise_writer_error(self):
+        """Si el escritor falló, libera ffmpeg y los buffers y relanza el error."""
+        error = self.writer_error
+        self.cleanup()
+        raise RuntimeError(f"El hilo escritor falló en el frame {self.frame_count}: {error!r}") from error
+
+    def _stop_writer(self):
+        """Espera a que el escritor vacíe la cola y termine."""
+        if self.writer is None:
+            return
+        self.frame_queue.put(None)
+        self.writer.join()
+        self.writer = None
+        self.frame_queue = None
+
+    def _create_pbos(self):
+        """Reserva el anillo de GL_PIXEL_PACK_BUFFER para la lectura."""
+        self.pbos = [int(pbo) for pbo in glGenBuffers(self.pbo_count)]
+        for pbo in self.pbos:
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+            glBufferData(GL_PIXEL_PACK_BUFFER, self.frame_size, None, GL_STREAM_READ)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.pbo_issued = 0
+        self.pbo_repeats = {}
+
+    def _map_pbo(self, pbo):
+        """Copia el contenido de un PBO a memoria de CPU."""
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+        ptr = glMapBuffer(GL_PIXEL_PACK_BUFFER, GL_READ_ONLY)
+        pixels = ctypes.string_at(ptr, self.frame_size)
+        glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        return pixels
+
+    def _flush_pbos(self):
+        """Entrega los frames que siguen pendientes en el anillo de PBOs."""
+        if not self.pbos:
+            return
+        pending = min(self.pbo_issued, self.pbo_count - 1)
+        for frame in range(self.pbo_issued - pending, self.pbo_issued):
+            if not self.enabled:
+                break
+            self._submit_pbo(frame)
+        self._delete_pbos()
+
+    def _delete_pbos(self):
+        if self.pbos:
+            glDeleteBuffers(len(self.pbos), self.pbos)
+            self.pbos = []
+
+    def _open_stream(self):
+        """Lanza ffmpeg leyendo video crudo rgb24 desde stdin."""
+        cmd = [
+            'ffmpeg',
+            '-y',  # Sobrescribir si existe
+            '-loglevel', 'error',
+            '-f', 'rawvideo',
+            '-pix_fmt', 'rgb24',
+            '-s', f"{self.width}x{self.height}",
+            '-framerate', str(self.fps),
+            '-i', '-',
+        ] + self._encoder_args(flip=True)
+
+        # stderr a un archivo: un PIPE sin leer puede bloquear a ffmpeg
+        self.ffmpeg_log = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self.ffmpeg_log
+        )
+
+    def _read_ffmpeg_log(self):
+        if self.ffmpeg_log is None:
+            return ""
+        self.ffmpeg_log.seek(0)
+        return self.ffmpeg_log.read().decode(errors='replace')
 
     def capture_frame(self):
         """Captura el frame actual de OpenGL."""
+        if self.writer_error is not None:
+            self._raise_writer_error()
+        if not self.enabled:
+            return
+
+        if not self.pbos:
+            # Leer pixels del framebuffer
+            with self._span('readback'):
+                pixels = glReadPixels(0, 0, self.width, self.height, GL_RGB, GL_UNSIGNED_BYTE)
+            self._submit_frame(pixels)
+            return
+
+        # Lectura asíncrona al PBO del frame actual
+        with self._span('readback'):
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, self.pbos[self.pbo_issued % self.pbo_count])
+            glReadPixelsRaw(0, 0, self.width, self.height, GL_RGB, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.pbo_issued += 1
+
+        # Con el anillo lleno, el PBO siguiente guarda el frame más antiguo
+        if self.pbo_issued >= self.pbo_count:
+            self._submit_pbo(self.pbo_issued - self.pbo_count)
+
+    def _submit_pbo(self, frame):
+        """Mapea el PBO del frame y lo entrega, seguido de sus repeticiones."""
+        with self._span('readback (map)'):
+            pixels = self._map_pbo(self.pbos[frame % self.pbo_count])
+        self._submit_frame(pixels)
+        for _ in range(self.pbo_repeats.pop(frame, 0)):
+            self._submit_frame(DUPLICATE_FRAME)
+
+    def duplicate_frame(self):
+        """Repite el último frame capturado (la escena no cambió)."""
         if not self.enabled:
             return
+        if self.pbos:
+            # El frame a repetir puede seguir en el anillo sin mapear
+            frame = self.pbo_issued - 1
+            self.pbo_repeats[frame] = self.pbo_repeats.get(frame, 0) + 1
+            return
+        self._submit_frame(DUPLICATE_FRAME)
+
+    def _submit_frame(self, pixels):
+        """Entrega un frame leído al escritor (bloquea si la cola está llena)."""
+        if self.writer is None:
+            self._write_frame(pixels)
+        else:
+            with self._span('queue wait'):
+                self.frame_queue.put(pixels)
 
-        # Leer pixels del framebuffer
-        pixels = glReadPixels(0, 0, self.width, self.height, GL_RGB, GL_UNSIGNED_BYTE)
-        image = np.frombuffer(pixels, dtype=np.uint8).reshape(self.height, self.width, 3)
+    def _write_frame(self, pixels):
+        """Envía el frame a ffmpeg o lo voltea y lo guarda como PPM."""
+        # Índice del frame escrito (el escritor va por detrás del render)
+        frame = self.frame_count
+        if self.encode_start is None:
+            self.encode_start = time.perf_counter()
+        duplicate = pixels is DUPLICATE_FRAME
+        if duplicate:
+            pixels = self.last_pixels
+        self.last_pixels = pixels
+        if self.stream:
+            try:
+                # Sin copia: ffmpeg recibe el buffer de OpenGL y lo voltea con vflip
+                with self._span('write', frame):
+                    self.process.stdin.write(memoryview(pixels))
+            except BrokenPipeError:
+                print(f"ffmpeg terminó inesperadamente: {self._read_ffmpeg_log()}")
+                self.enabled = False
+                return
+        elif duplicate:
+            # Mismo contenido: enlace al PPM anterior, sin voltear ni escribir
+            frame_path = os.path.join(self.frame_dir, f"frame_{self.frame_count:05d}.ppm")
+            with self._span('write', frame):
+                os.link(self.last_frame_path, frame_path)
+        else:
+            with self._span('flip', frame):
+                image = np.frombuffer(pixels, dtype=np.uint8).reshape(self.height, self.width, 3)
 
-        # Voltear verticalmente (OpenGL tiene origen abajo-izquierda)
-        image = np.flipud(image)
+                # Voltear verticalmente (OpenGL tiene origen abajo-izquierda)
+                data = np.flipud(image).tobytes()
 
-        # Guardar como PPM (formato simple, sin dependencias extra)
-        frame_path = os.path.join(self.frame_dir, f"frame_{self.frame_count:05d}.ppm")
-        with open(frame_path, 'wb') as f:
-            f.write(f"P6\n{self.width} {self.height}\n255\n".encode())
-            f.write(image.tobytes())
+            # Guardar como PPM (formato simple, sin dependencias extra)
+            frame_path = os.path.join(self.frame_dir, f"frame_{self.frame_count:05d}.ppm")
+            with self._span('write', frame):
+                with open(frame_path, 'wb') as f:
+                    f.write(f"P6\n{self.width} {self.height}\n255\n".encode())
+                    f.write(data)
+            self.last_frame_path = frame_path
 
         self.frame_count += 1
 
@@ -49,9 +326,24 @@ class VideoRenderer:
             print(f"  Frame {self.frame_count}...")
 
     def generate_video(self):
-        """Genera el video MP4 con ffmpeg."""
+        """Genera el video con ffmpeg; devuelve True si quedó escrito."""
+        if self.enabled:
+            self._flush_pbos()
+        # Deshabilitado por un error: los frames pendientes del anillo se descartan
+        self._delete_pbos()
+        self._stop_writer()
+
+        if self.writer_error is not None:
+            # ffmpeg recibió un video incompleto: no se da por generado
+            print(f"Video no generado: el hilo escritor falló ({self.writer_error!r})")
+            self.cleanup()
+            return False
+
+        if self.stream:
+            return self._finish_stream()
+
         if not self.enabled or self.frame_count == 0:
-            return
+            return False
 
         print(f"\nGenerando video con {self.frame_count} frames...")
 
@@ -61,30 +353,113 @@ class VideoRenderer:
             '-y',  # Sobrescribir si existe
             '-framerate', str(self.fps),
             '-i', os.path.join(self.frame_dir, 'frame_%05d.ppm'),
-            '-c:v', 'libx264',
-            '-preset', 'slow',
-            '-crf', '18',  # Alta calidad
-            '-pix_fmt', 'yuv420p',
-            self.output_name
-        ]
+        ] + self._encoder_args()
 
         try:
-            subprocess.run(cmd, check=True, capture_output=True)
+            start = time.perf_counter()
+            with self._span('encode', self.frame_count):
+                subprocess.run(cmd, check=True, capture_output=True)
             print(f"Video generado: {self.output_name}")
+            elapsed = time.perf_counter() - start
+            self._report_encode(elapsed, elapsed)
+            return True
         except subprocess.CalledProcessError as e:
             print(f"Error generando video: {e.stderr.decode()}")
+            return False
         finally:
             # Limpiar frames temporales
             shutil.rmtree(self.frame_dir)
             print("Frames temporales eliminados.")
 
+    def _finish_stream(self):
+        """Cierra stdin de ffmpeg y espera a que termine de codificar."""
+        if self.process is None:
+            return False
+
+        print(f"\nFinalizando video con {self.frame_count} frames...")
+        # encode: lo que ffmpeg tarda en terminar tras el último frame
+        close_start = time.perf_counter()
+        with self._span('encode', self.frame_count):
+            try:
+                self.process.stdin.close()
+            except BrokenPipeError:
+                pass
+            returncode = self.process.wait()
+        self.process = None
+        end = time.perf_counter()
+
+        ok = returncode == 0 and self.frame_count > 0
+        if ok:
+            print(f"Video generado: {self.output_name}")
+            self._report_encode(end - self.encode_start, end - close_start)
+        else:
+            print(f"Error generando video: {self._read_ffmpeg_log()}")
+
+        self.ffmpeg_log.close()
+        self.ffmpeg_log = None
+        return ok
+
+    def _report_encode(self, elapsed, tail):
+        """fps de codificación y lo que ffmpeg tardó tras recibir el último frame.
+
+        En streaming elapsed va del primer frame escrito al final de
+        ffmpeg: si tail es casi 0 el encoder sigue el ritmo del render y
+        los fps son los del render; si no, los fps son los del encoder.
+        """
+        self.encode_fps = self.frame_count / elapsed if elapsed > 0 else 0.0
+        print(f"Encoder {self.encoder}: {self.frame_count} frames en {elapsed:.1f} s "
+              f"({self.encode_fps:.1f} fps), {tail:.1f} s tras el último frame")
+
     def cleanup(self):
         """Limpia recursos si no se generó video."""
-        if os.path.exists(self.frame_dir):
+        self.enabled = False
+        self._stop_writer()
+        self._delete_pbos()
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            self.process = None
+        if self.ffmpeg_log is not None:
+            self.ffmpeg_log.close()
+            self.ffmpeg_log = None
+        if self.frame_dir and os.path.exists(self.frame_dir):
             shutil.rmtree(self.frame_dir)
 
 
+def concat_videos(paths, output_name):
+    """Une segmentos con el concat demuxer de ffmpeg, sin recodificar.
+
+    Los segmentos deben tener el mismo codec, resolución y fps.
+    """
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        for path in paths:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+        list_path = f.name
+
+    cmd = [
+        'ffmpeg',
+        '-y',
+        '-f', 'concat',
+        '-safe', '0',
+        '-i', list_path,
+        '-c', 'copy',
+        output_name
+    ]
+    try:
+        subprocess.run(cmd, check=True, capture_output=True)
+        print(f"Video generado: {output_name}")
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"Error uniendo segmentos: {e.stderr.decode()}")
+        return False
+    finally:
+        os.remove(list_path)
+
+
 def parse_render_args():
-    """Parsea argumentos de línea de comandos para renderizado."""
-    import sys
-    return '--mp4' in sys.argv or '--render' in sys.argv
+    """Parsea argumentos de línea de comandos para renderizado.
+
+    --headless implica renderizar a video: sin ventana no hay preview.
+    """
+    return '--mp4' in sys.argv or '--render' in sys.argv or '--headless' in sys.argv
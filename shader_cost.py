@@ -0,0 +1,120 @@
+# shader_cost.py - Coste GPU de cada sección de un fragment shader
+#
+#   python3 shader_cost.py brana_colision [--samples 8] [--repeat 5] [--headless]
+#
+# Las secciones se marcan en el shader con
+#
+#   #ifndef SKIP_PROTON
+#       ... bloque caro ...
+#   #endif
+#
+# (con un valor por defecto barato antes del bloque). La herramienta
+# compila el shader completo y una variante por sección con SKIP_<nombre>
+# definido, mide cada una con GL_TIME_ELAPSED sobre los mismos u_time y
+# reporta el coste marginal de cada sección (completo - sin la sección).
+# Acepta cualquier escena de render_all.py o cualquier módulo con una
+# subclase de ShaderScene; sin secciones SKIP_ solo mide el total.
+import gl_context  # antes de OpenGL (--headless)
+import re
+import sys
+import argparse
+import numpy as np
+from OpenGL.GL import (
+    glGenQueries, glDeleteQueries, glBeginQuery, glEndQuery, glFinish, GL_TIME_ELAPSED,
+)
+from profiler import query_elapsed_ns
+from shader_library import preprocess, with_defines
+from render_all import SCENES, find_scene, parse_scene_args
+
+SECTION = re.compile(r'^[ \t]*#ifndef[ \t]+SKIP_(\w+)', re.MULTILINE)
+
+
+def sections(fragment_shader):
+    """Nombres de las secciones SKIP_ en orden de aparición (sin repetir)."""
+    return list(dict.fromkeys(SECTION.findall(preprocess(fragment_shader))))
+
+
+def variant(scene_class, skipped):
+    """Subclase de la escena con SKIP_<nombre> definido para cada sección de skipped."""
+    source = preprocess(scene_class.fragment_shader)
+    if skipped:
+        source = with_defines(source, {f"SKIP_{name}": '' for name in skipped})
+    label = "_".join(skipped) or "completo"
+    # Sin reparto por regiones: cada variante sombrea la pantalla entera
+    return type(f"{scene_class.__name__}_{label}", (scene_class,),
+                {'fragment_shader': source, 'region_variants': ()})
+
+
+def gpu_ms(scene, times, repeat, query):
+    """Mediana de `repeat` medidas por instante, promediada sobre times (ms/frame)."""
+    scene.draw(times[0])
+    glFinish()  # primer dibujo (compilación diferida del driver) fuera de la medida
+
+    per_sample = []
+    for t in times:
+        runs = []
+        for _ in range(repeat):
+            glBeginQuery(GL_TIME_ELAPSED, query)
+            scene.draw(t)
+            glEndQuery(GL_TIME_ELAPSED)
+            runs.append(query_elapsed_ns(query) / 1e6)
+        per_sample.append(np.median(runs))
+    return float(np.mean(per_sample))
+
+
+def measure(scene_class, samples, repeat):
+    """{etiqueta: ms/frame} del shader completo, sin cada sección y sin todas."""
+    names = sections(scene_class.fragment_shader)
+    times = np.linspace(0.0, scene_class.duration, samples, endpoint=False) + 0.5 / scene_class.fps
+    variants = [()] + [(name,) for name in names]
+    if len(names) > 1:
+        variants.append(tuple(names))
+
+    context = gl_context.create_context(*scene_class.resolution, "ThöEv - shader_cost")
+    query = int(glGenQueries(1)[0])
+    results = {}
+    try:
+        for skipped in variants:
+            scene = variant(scene_class, skipped)(context=context, noise_texture=False)
+            results[skipped] = gpu_ms(scene, times, repeat, query)
+            scene.release()
+    finally:
+        glDeleteQueries(1, [query])
+        context.terminate()
+    return names, results
+
+
+def print_report(name, names, results):
+    full = results[()]
+    print(f"\n{name}: {full:.2f} ms/frame con todas las secciones")
+    if not names:
+        print("El shader no tiene secciones #ifndef SKIP_<NOMBRE>; solo se mide el total.")
+        return
+
+    print(f"{'Sección':16s} {'sin ella':>10s} {'coste marginal':>16s}")
+    for section in names:
+        without = results[(section,)]
+        cost = full - without
+        print(f"{section:16s} {without:8.2f} ms {cost:10.2f} ms ({cost / full * 100.0:5.1f}%)")
+    if len(names) > 1:
+        rest = results[tuple(names)]
+        print(f"{'(resto)':16s} {rest:8.2f} ms   sin ninguna sección ({rest / full * 100.0:.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    parser.add_argument('--samples', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=5)
+    options, names = parse_scene_args(parser)
+    if len(names) != 1:
+        print("Uso: python3 shader_cost.py <escena|módulo> [--samples N] [--repeat N] [--headless]")
+        print(f"Escenas: {', '.join(SCENES)}")
+        sys.exit(1)
+
+    scene_class = find_scene(names[0])
+    section_names, results = measure(scene_class, options.samples, options.repeat)
+    print_report(names[0], section_names, results)
+
+
+if __name__ == "__main__":
+    main()
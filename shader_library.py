@@ -0,0 +1,41 @@
+# shader_library.py - #include para los fragment shaders (librería en glsl/)
+#
+# Las funciones comunes (hash, noise, fbm, curl, W, bumpFunc, palette)
+# viven una sola vez en glsl/*.glsl y las escenas las incluyen con
+#
+#   #include "noise.glsl"
+#
+# El preprocesado se hace en Python antes de compileShader. Cada archivo
+# se incluye una sola vez por shader (como #pragma once), así noise.glsl
+# puede incluir hash.glsl aunque la escena también lo incluya.
+import os
+import re
+
+GLSL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'glsl')
+
+INCLUDE = re.compile(r'^[ \t]*#include[ \t]+"([^"]+)"[ \t]*$', re.MULTILINE)
+
+
+def preprocess(source, include_dir=GLSL_DIR, included=None):
+    """Sustituye cada #include "archivo" por su contenido, recursivamente."""
+    if included is None:
+        included = set()
+
+    def expand(match):
+        path = os.path.normpath(os.path.join(include_dir, match.group(1)))
+        if path in included:
+            return ""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"#include \"{match.group(1)}\": no existe {path}")
+        included.add(path)
+        with open(path, 'r') as f:
+            return preprocess(f.read(), os.path.dirname(path), included).rstrip('\n')
+
+    return INCLUDE.sub(expand, source)
+
+
+def with_defines(source, defines):
+    """Inserta #define tras la línea #version del shader."""
+    lines = [f"#define {name} {value}".rstrip() for name, value in defines.items()]
+    head, newline, rest = source.lstrip().partition('\n')
+    return head + newline + '\n'.join(lines) + '\n' + rest
@@ -0,0 +1,176 @@
+# shader_reload.py - Recarga en vivo del fragment shader en el preview (--live)
+#
+#   python3 brana_electron.py --live
+#
+# ShaderReloader vigila por mtime los archivos que incluye el shader de la
+# escena (los anota shader_library.preprocess). Al guardar uno se vuelven a
+# preprocesar las variantes y se compilan sin esperar al driver: con
+# GL_ARB/KHR_parallel_shader_compile el preview sigue dibujando con el
+# programa anterior y en cada frame se consulta GL_COMPLETION_STATUS; sin
+# la extensión la compilación bloquea ese frame.
+#
+# Si todas las variantes enlazan, la escena cambia de programas de una vez
+# (ShaderScene.replace_programs) y el binario queda en la cache; si alguna
+# falla se imprime el log del compilador y se sigue con los anteriores. El
+# reloj del preview no se toca, así que u_time sigue donde estaba; con
+# --live el preview vuelve al inicio al llegar al final en vez de cerrarse.
+#
+# Solo se recarga lo que viene de archivos: para editar en vivo el shader
+# de una escena hay que moverlo a glsl/scenes/ e incluirlo desde el .py
+# (como brana_electron.py). El #version debe ser la primera línea del archivo.
+import os
+import sys
+import time
+from OpenGL.GL import *
+from shader_library import preprocess
+from program_cache import PROGRAM_CACHE, binary_supported, cache_path, save_binary
+
+LIVE = '--live' in sys.argv
+
+# GL_COMPLETION_STATUS_ARB y _KHR comparten valor
+GL_COMPLETION_STATUS = 0x91B1
+PARALLEL_EXTENSIONS = ('GL_ARB_parallel_shader_compile', 'GL_KHR_parallel_shader_compile')
+
+
+def parallel_compile_supported():
+    names = {glGetStringi(GL_EXTENSIONS, i) for i in range(glGetIntegerv(GL_NUM_EXTENSIONS))}
+    names = {name.decode() if isinstance(name, bytes) else name for name in names}
+    return any(extension in names for extension in PARALLEL_EXTENSIONS)
+
+
+def info_log(log):
+    return (log.decode() if isinstance(log, bytes) else log).strip()
+
+
+def start_shader(source, shader_type):
+    """glCompileShader sin consultar el estado (eso esperaría al driver)."""
+    shader = glCreateShader(shader_type)
+    glShaderSource(shader, source)
+    glCompileShader(shader)
+    return shader
+
+
+class ProgramBuild:
+    """Compilación y enlace en curso de las variantes de un shader."""
+
+    def __init__(self, vertex_source, sources):
+        self.vertex_source = vertex_source
+        self.sources = sources
+        self.start = time.perf_counter()
+        self.jobs = {}
+        for skipped, fragment_source in sources.items():
+            program = glCreateProgram()
+            shaders = [start_shader(vertex_source, GL_VERTEX_SHADER),
+                       start_shader(fragment_source, GL_FRAGMENT_SHADER)]
+            for shader in shaders:
+                glAttachShader(program, shader)
+            glProgramParameteri(program, GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL_TRUE)
+            glLinkProgram(program)
+            self.jobs[skipped] = (program, shaders)
+
+    def done(self):
+        """True cuando el driver terminó todas las variantes (no bloquea)."""
+        return all(glGetProgramiv(program, GL_COMPLETION_STATUS)
+                   for program, _ in self.jobs.values())
+
+    def error_log(self, program, shaders):
+        logs = [info_log(glGetShaderInfoLog(shader)) for shader in shaders
+                if glGetShaderiv(shader, GL_COMPILE_STATUS) != GL_TRUE]
+        return "\n".join(logs) or info_log(glGetProgramInfoLog(program))
+
+    def finish(self):
+        """{secciones: programa} si todas enlazaron; si no, RuntimeError con el log.
+
+        Las variantes comparten el código, así que basta el log de la
+        primera que falle.
+        """
+        error = None
+        for skipped, (program, shaders) in self.jobs.items():
+            if error is None and glGetProgramiv(program, GL_LINK_STATUS) != GL_TRUE:
+                label = f" (sin {', '.join(skipped)})" if skipped else ""
+                error = f"Error de compilación{label}:\n{self.error_log(program, shaders)}"
+            for shader in shaders:
+                glDetachShader(program, shader)
+                glDeleteShader(shader)
+
+        programs = {skipped: program for skipped, (program, _) in self.jobs.items()}
+        if error is not None:
+            for program in programs.values():
+                glDeleteProgram(program)
+            raise RuntimeError(error)
+
+        if PROGRAM_CACHE and binary_supported():
+            for skipped, program in programs.items():
+                save_binary(program, cache_path(self.vertex_source, self.sources[skipped]))
+        return programs
+
+
+class ShaderReloader:
+    """Recompila el shader de la escena cuando cambia alguno de sus archivos.
+
+    poll() se llama una vez por frame desde el preview; como mucho mira
+    los mtime cada `interval` segundos.
+    """
+
+    def __init__(self, scene, interval=0.25):
+        self.scene = scene
+        self.interval = interval
+        self.files = scene.shader_files
+        self.mtimes = self.current_mtimes()
+        self.checked = time.perf_counter()
+        self.parallel = parallel_compile_supported()
+        self.build = None
+        mode = "en paralelo" if self.parallel else "bloqueando un frame"
+        print(f"{scene.title}: --live vigila {len(self.files)} archivos del shader, compilación {mode}")
+        if not self.files:
+            print("  (el shader está escrito en el .py: muévelo a glsl/scenes/ para editarlo en vivo)")
+
+    def current_mtimes(self):
+        mtimes = {}
+        for path in self.files:
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                mtimes[path] = None
+        return mtimes
+
+    def poll(self):
+        if self.build is not None:
+            if self.build.done():
+                self.finish()
+            return
+
+        now = time.perf_counter()
+        if now - self.checked < self.interval:
+            return
+        self.checked = now
+
+        mtimes = self.current_mtimes()
+        if mtimes == self.mtimes:
+            return
+        self.mtimes = mtimes
+        try:
+            sources, files = self.scene.build_sources()
+        except (FileNotFoundError, ValueError) as e:
+            # #include a un archivo que no existe (todavía) o shader sin vPos con --checkerboard
+            print(f"{self.scene.title}: shader no recargado: {e}")
+            return
+        # Un #include nuevo pasa a vigilarse desde ya
+        self.files = files
+        self.mtimes = self.current_mtimes()
+
+        self.build = ProgramBuild(preprocess(self.scene.vertex_shader), sources)
+        if not self.parallel:
+            self.finish()
+
+    def finish(self):
+        build, self.build = self.build, None
+        try:
+            programs = build.finish()
+        except RuntimeError as e:
+            print(f"{self.scene.title}: shader no recargado, sigue el anterior.\n{e}")
+            return
+        self.scene.replace_programs(programs, build.sources[()])
+        self.scene.shader_files = self.files
+        elapsed = time.perf_counter() - build.start
+        print(f"{self.scene.title}: shader recargado en {elapsed * 1000.0:.0f} ms")
@@ -0,0 +1,463 @@
+# shader_scene.py - Base común para las escenas de un solo fragment shader
+from gl_context import create_context  # antes de OpenGL (--headless)
+from OpenGL.GL import *
+import numpy as np
+import os
+import sys
+import time
+import ctypes
+import inspect
+import contextlib
+from render_utils import VideoRenderer
+from frame_scheduler import FrameScheduler
+from render_scale import RENDER_SCALE, ADAPTIVE_SCALE, ScaledTarget, AdaptiveScale
+from checkerboard import CHECKERBOARD, CheckerboardTarget, checker_source
+from profiler import PROFILE, PROFILE_OUT, FrameProfiler, null_span
+from noise_texture import NOISE_TEXTURE, NOISE_UNIT, NoiseTexture
+from shader_library import preprocess, with_defines
+from program_cache import load_program
+from encoders import encoder_preset
+from render_chunks import CHUNK_SIZE, render_chunked
+from config_loader import ConfigWatcher
+from shader_reload import LIVE, ShaderReloader
+
+# Quad a pantalla completa; vPos va de -1 a 1 en ambos ejes
+VERTEX_SHADER = """
+#version 330 core
+layout (location = 0) in vec2 aPos;
+out vec2 vPos;
+void main() {
+    vPos = aPos;
+    gl_Position = vec4(aPos, 0.0, 1.0);
+}
+"""
+
+# Función glUniform* según el tipo GLSL reportado por glGetActiveUniform
+UNIFORM_SETTERS = {
+    GL_FLOAT: glUniform1f,
+    GL_FLOAT_VEC2: glUniform2f,
+    GL_FLOAT_VEC3: glUniform3f,
+    GL_FLOAT_VEC4: glUniform4f,
+    GL_INT: glUniform1i,
+    GL_BOOL: glUniform1i,
+    GL_SAMPLER_2D: glUniform1i,
+}
+
+
+def uniform_table(program):
+    """Resuelve una sola vez {nombre: (location, setter)} de un programa enlazado."""
+    table = {}
+    for index in range(glGetProgramiv(program, GL_ACTIVE_UNIFORMS)):
+        name, size, gl_type = glGetActiveUniform(program, index)
+        if isinstance(name, bytes):
+            name = name.decode()
+        name = name.split('[')[0]
+        setter = UNIFORM_SETTERS.get(gl_type)
+        if setter is not None:
+            table[name] = (glGetUniformLocation(program, name), setter)
+    return table
+
+
+class ShaderScene:
+    """Escena de un quad a pantalla completa con un fragment shader.
+
+    Las subclases definen fragment_shader, resolution, fps, duration y
+    title, y devuelven sus uniforms como diccionarios {nombre: valor}:
+    static_uniforms() se sube una vez al compilar (config, resolución) y
+    frame_uniforms(t) en cada frame (por defecto solo u_time). Las
+    locations se resuelven una vez tras enlazar, así el loop no
+    llama a glGetUniformLocation. Los bloques de uniform_blocks
+    (UniformBlock) se enlazan al programa y se suben desde self.config.
+
+    Los shaders pueden usar #include "archivo.glsl" (librería en glsl/) y
+    el programa enlazado se guarda en cache/programs/ (program_cache.py).
+    Si el shader tiene rama #ifdef NOISE_TEXTURE y se pide noise_texture
+    (--noise-texture, solo en preview), fbm/curl se leen de la textura de
+    noise_texture.py.
+    Las escenas con cámara fija pueden declarar checkerboard = True para
+    admitir el preview en damero (--checkerboard, ver checkerboard.py).
+
+    Las escenas cuyo shader tiene secciones #ifndef SKIP_<NOMBRE> que solo
+    se ven en parte de la pantalla declaran en region_variants las
+    combinaciones de secciones a saltar y devuelven en regions(t, width)
+    franjas verticales [(x0, x1, secciones)]: cada franja se dibuja con
+    glScissor y la variante compilada sin esas secciones.
+
+    En preview, guardar config/config.json vuelve a subir los uniforms que
+    salen de self.config sin reiniciar ni recompilar (apply_config).
+    Con --live, guardar un archivo que incluye el shader lo recompila y
+    cambia el programa sin cortar el preview (shader_reload.py).
+    """
+
+    title = "ThöEv"
+    vertex_shader = VERTEX_SHADER
+    fragment_shader = None
+    resolution = (1280, 720)
+    fps = 30
+    duration = 10.0
+    config = None
+    uniform_blocks = ()
+    output_name = None
+    checkerboard = False
+    region_variants = ()
+
+    def __init__(self, render_video=False, context=None, output_name=None, noise_texture=None,
+                 chunk_size=None):
+        self.width, self.height = self.resolution
+        # Con un contexto compartido (render_all) la escena no lo cierra al terminar
+        self.owns_context = context is None
+        self.context = context or create_context(self.width, self.height, self.title)
+
+        glViewport(0, 0, self.width, self.height)
+
+        if noise_texture is None:
+            # --noise-texture es solo para preview: el video usa siempre el ruido procedural
+            noise_texture = NOISE_TEXTURE and not render_video
+        self.noise = None
+        if noise_texture and 'NOISE_TEXTURE' in preprocess(self.fragment_shader):
+            self.noise = NoiseTexture()
+        # El damero es solo para preview: el video sombrea siempre todos los píxeles
+        self.use_checker = CHECKERBOARD and self.checkerboard and not render_video
+
+        sources, self.shader_files = self.build_sources()
+        self.fragment_source = sources[()]
+        self.programs = {}
+        for skipped, source in sources.items():
+            program, origin, seconds = load_program(preprocess(self.vertex_shader), source)
+            label = f" sin {', '.join(skipped)}" if skipped else ""
+            print(f"{self.title}: programa{label} {origin} en {seconds * 1000.0:.0f} ms")
+            self.programs[skipped] = (program, uniform_table(program))
+        self.use_program(())
+
+        vertices = np.array([-1, -1, -1, 1, 1, 1, 1, -1], dtype=np.float32)
+
+        self.vao = glGenVertexArrays(1)
+        self.vbo = glGenBuffers(1)
+
+        glBindVertexArray(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 8, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(0)
+
+        self.checker = None
+        if self.use_checker:
+            self.checker = CheckerboardTarget(self.width, self.height,
+                                              preprocess(self.vertex_shader), self.vao)
+
+        self.upload_static_uniforms()
+
+        output_name = output_name or self.output_name or self.default_output_name()
+
+        # --profile: tiempos por etapa (GPU y CPU) de cada frame, ver profiler.py
+        self.profiler = None
+        self.span = null_span
+        if PROFILE:
+            stem = os.path.splitext(os.path.basename(output_name))[0]
+            self.profiler = FrameProfiler(PROFILE_OUT or f"profile_{stem}.csv")
+            self.span = self.profiler.span
+
+        self.renderer = self.make_renderer(output_name)
+        self.frames_rendered = 0
+
+        # --chunks N: el video se escribe por bloques reanudables (render_chunks.py)
+        self.render_video = render_video
+        self.chunk_size = (CHUNK_SIZE if chunk_size is None else chunk_size) if render_video else 0
+        if render_video and not self.chunk_size:
+            self.renderer.enable()
+
+    def build_sources(self):
+        """Preprocesa fragment_shader (leyendo de nuevo sus #include).
+
+        Devuelve ({secciones saltadas: fuente} de cada variante, archivos
+        incluidos); la variante () es el shader completo.
+        """
+        included = set()
+        fragment_shader = preprocess(self.fragment_shader, included=included)
+        if self.noise is not None:
+            fragment_shader = self.noise.shader_source(fragment_shader)
+        if self.use_checker:
+            fragment_shader = checker_source(fragment_shader)
+
+        # Variantes por región (sin secciones SKIP_); el damero dibuja siempre el completo
+        variants = [()] if self.use_checker else [()] + [tuple(v) for v in self.region_variants]
+        sources = {}
+        for skipped in variants:
+            source = fragment_shader
+            if skipped:
+                source = with_defines(source, {f"SKIP_{name}": '' for name in skipped})
+            sources[skipped] = source
+        return sources, sorted(included)
+
+    def replace_programs(self, programs, fragment_source):
+        """Cambia todas las variantes a la vez por programas ya enlazados (--live).
+
+        Los uniforms estáticos se suben a los nuevos y los anteriores se
+        borran; el reloj no cambia, así que el siguiente frame usa el
+        mismo u_time.
+        """
+        previous = self.programs
+        self.programs = {skipped: (program, uniform_table(program))
+                         for skipped, program in programs.items()}
+        self.fragment_source = fragment_source
+        self.upload_static_uniforms()
+        for program, _ in previous.values():
+            glDeleteProgram(program)
+
+    def make_renderer(self, output_name):
+        """VideoRenderer de la escena hacia output_name, sin activar."""
+        renderer = VideoRenderer(self.width, self.height, self.fps, output_name,
+                                 encoder=encoder_preset(self.config))
+        renderer.profiler = self.profiler
+        return renderer
+
+    def default_output_name(self):
+        """<modulo de la escena>.mp4, p. ej. brana_colision.mp4 (el preset ajusta la extensión)."""
+        module_file = inspect.getfile(type(self))
+        return os.path.splitext(os.path.basename(module_file))[0] + ".mp4"
+
+    def static_uniforms(self):
+        """Uniforms constantes durante toda la escena."""
+        return {}
+
+    def frame_uniforms(self, t):
+        """Uniforms que cambian en cada frame."""
+        return {'u_time': t}
+
+    def frame_key(self, t):
+        """Lo que determina la imagen en t; None obliga a dibujar siempre.
+
+        Dos frames seguidos con la misma clave son idénticos y el video
+        repite el anterior (render_frames). Por defecto son los uniforms
+        del frame: una escena que congela su imagen devuelve en
+        frame_uniforms los valores efectivos (p. ej. el tiempo ya
+        limitado) o sobrescribe este método.
+        """
+        return sorted(self.frame_uniforms(t).items())
+
+    def set_uniforms(self, values):
+        """Sube {nombre: valor} al programa activo usando la tabla cacheada."""
+        for name, value in values.items():
+            entry = self.uniforms.get(name)
+            if entry is None:
+                # Uniform inexistente u optimizado por el compilador
+                continue
+            location, setter = entry
+            if isinstance(value, (tuple, list)):
+                setter(location, *value)
+            else:
+                setter(location, value)
+
+    def use_program(self, skipped):
+        """Activa la variante sin las secciones skipped (() = shader completo)."""
+        self.shader, self.uniforms = self.programs[skipped]
+        glUseProgram(self.shader)
+
+    def upload_static_uniforms(self):
+        for skipped in self.programs:
+            self.use_program(skipped)
+            self.set_uniforms({'u_resolution': (self.width, self.height), 'u_noise': NOISE_UNIT})
+            self.set_uniforms(self.static_uniforms())
+            for block in self.uniform_blocks:
+                block.bind(self.shader)
+                block.upload(self.config)
+        self.use_program(())
+
+    def apply_config(self, config):
+        """Cambia el config y vuelve a subir los uniforms estáticos, sin recompilar.
+
+        render.resolution y render.fps fijan la ventana y el reloj: esos
+        cambios esperan al siguiente arranque.
+        """
+        restart = [f"render.{key}" for key in ('resolution', 'fps')
+                   if config['render'][key] != self.config['render'].get(key)]
+        self.config = config
+        self.upload_static_uniforms()
+        note = f" ({', '.join(restart)} requiere reiniciar)" if restart else ""
+        print(f"{self.title}: config recargado{note}")
+
+    def regions(self, t, width):
+        """Franjas [(x0, x1, secciones a saltar)] en píxeles, o None para el quad entero."""
+        return None
+
+    def draw(self, t):
+        """Dibuja el frame del instante t en el framebuffer actual."""
+        glClearColor(0, 0, 0, 1)
+        glClear(GL_COLOR_BUFFER_BIT)
+
+        if self.noise is not None:
+            self.noise.bind()
+        glBindVertexArray(self.vao)
+
+        regions = None
+        if len(self.programs) > 1:
+            # Ancho del viewport actual: la ventana o el FBO reducido de --scale
+            x, y, width, height = glGetIntegerv(GL_VIEWPORT)
+            regions = self.regions(t, width)
+        if regions is None:
+            self.use_program(())
+            self.set_uniforms(self.frame_uniforms(t))
+            glDrawArrays(GL_TRIANGLE_FAN, 0, 4)
+            return
+
+        # Fuera de las franjas queda el negro del glClear
+        glEnable(GL_SCISSOR_TEST)
+        for x0, x1, skipped in regions:
+            if x1 <= x0:
+                continue
+            glScissor(x + x0, y, x1 - x0, height)
+            self.use_program(skipped)
+            self.set_uniforms(self.frame_uniforms(t))
+            glDrawArrays(GL_TRIANGLE_FAN, 0, 4)
+        glDisable(GL_SCISSOR_TEST)
+        self.use_program(())
+
+    @contextlib.contextmanager
+    def profile_frame(self, frame):
+        """Mide el dibujo del frame: query GL_TIME_ELAPSED y envío en CPU."""
+        if self.profiler is None:
+            yield
+            return
+        self.profiler.frame = frame
+        self.profiler.begin_gpu()
+        with self.profiler.span('draw (CPU)'):
+            yield
+        self.profiler.end_gpu()
+
+    def draw_checkerboard(self, t):
+        """Dibuja el frame t sombreando la mitad del damero que toca."""
+        for parity in self.checker.parities():
+            self.checker.begin()
+            glUseProgram(self.shader)
+            self.set_uniforms({'u_checker_parity': parity})
+            self.draw(t)
+            self.checker.resolve(parity)
+        self.checker.present()
+
+    def total_frames(self):
+        return int(self.duration * self.fps)
+
+    def render_frames(self, start, stop):
+        """Renderiza a video los frames [start, stop); el frame n es t = n / fps.
+
+        La escena es función pura de u_time, así que cualquier rango se
+        puede renderizar por separado (ver render_parallel.py). Si
+        frame_key(t) no cambia respecto del frame anterior no se dibuja ni
+        se lee de la GPU: el renderer repite el último frame.
+
+        Devuelve True si el video quedó generado.
+        """
+        frame_time = 1.0 / self.fps
+        previous_key = None
+        duplicates = 0
+        for frame in range(start, stop):
+            if self.context.should_close():
+                break
+
+            self.frames_rendered += 1
+            t = frame * frame_time
+            key = self.frame_key(t)
+            if key is not None and key == previous_key:
+                self.renderer.duplicate_frame()
+                duplicates += 1
+                continue
+            previous_key = key
+
+            with self.profile_frame(frame):
+                self.draw(t)
+
+            self.renderer.capture_frame()
+
+            self.context.swap_buffers()
+            self.context.poll_events()
+
+        if duplicates:
+            print(f"{duplicates} frames repetidos sin dibujar ni leer de la GPU")
+        return self.renderer.generate_video()
+
+    def finish_profile(self):
+        """Con --profile, escribe el archivo de tiempos y muestra el resumen."""
+        if self.profiler:
+            self.profiler.finish()
+
+    def run(self):
+        if self.render_video:
+            # Renderizado controlado por frames para video
+            if self.chunk_size:
+                render_chunked(self, self.chunk_size)
+            else:
+                self.render_frames(0, self.total_frames())
+            self.finish_profile()
+        else:
+            # Demo en tiempo real: --no-drop muestra todos los frames aunque vaya lento
+            drop_frames = '--no-drop' not in sys.argv
+            scheduler = FrameScheduler(self.fps, drop_frames=drop_frames)
+            # --scale / --adaptive-scale: sombrear a menor resolución y reescalar
+            adaptive = AdaptiveScale(self.fps, RENDER_SCALE) if ADAPTIVE_SCALE else None
+            target = None
+            if self.checker:
+                adaptive = None
+            elif adaptive or RENDER_SCALE < 1.0:
+                target = ScaledTarget(self.width, self.height, RENDER_SCALE)
+            # config.json se vigila por mtime: al guardarlo cambian los uniforms
+            watcher = ConfigWatcher() if self.config is not None else None
+            # --live: el shader se recompila al guardar sus archivos (shader_reload.py)
+            reloader = ShaderReloader(self) if LIVE else None
+
+            while not self.context.should_close():
+                t = scheduler.time
+
+                if t > self.duration:
+                    if not reloader:
+                        break
+                    # Editando en vivo la ventana no se cierra: vuelve al inicio
+                    scheduler = FrameScheduler(self.fps, drop_frames=drop_frames)
+                    continue
+
+                if watcher:
+                    config = watcher.poll()
+                    if config is not None:
+                        self.apply_config(config)
+                if reloader:
+                    reloader.poll()
+
+                frame_start = time.perf_counter()
+                with self.profile_frame(scheduler.frame_index):
+                    if self.checker:
+                        self.draw_checkerboard(t)
+                    else:
+                        if target:
+                            target.begin()
+                        self.draw(t)
+                        if target:
+                            target.end()
+
+                with self.span('swap'):
+                    self.context.swap_buffers()
+                if adaptive:
+                    target.resize(adaptive.update(time.perf_counter() - frame_start))
+                self.context.poll_events()
+                scheduler.wait()
+
+            print(scheduler.summary())
+            self.finish_profile()
+            if target:
+                print(f"Escala de render final: {target.scale:.2f} "
+                      f"({target.scaled_width}x{target.scaled_height})")
+                target.release()
+
+        if self.owns_context:
+            self.context.terminate()
+        else:
+            self.release()
+
+    def release(self):
+        """Libera programas y buffers dejando vivo el contexto compartido."""
+        for program, _ in self.programs.values():
+            glDeleteProgram(program)
+        if self.noise is not None:
+            self.noise.release()
+        if self.checker is not None:
+            self.checker.release()
+        glDeleteVertexArrays(1, [self.vao])
+        glDeleteBuffers(1, [self.vbo])
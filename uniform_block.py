@@ -0,0 +1,79 @@
+# uniform_block.py - Uniform Buffer Objects std140 generados desde config.json
+from OpenGL.GL import (
+    glGenBuffers, glBindBuffer, glBufferData, glBufferSubData, glBindBufferBase,
+    glGetUniformBlockIndex, glUniformBlockBinding,
+    GL_UNIFORM_BUFFER, GL_DYNAMIC_DRAW, GL_INVALID_INDEX,
+)
+import numpy as np
+
+# Tipo GLSL -> (alineación std140 en bytes, componentes float)
+STD140_TYPES = {
+    'float': (4, 1),
+    'vec2': (8, 2),
+    'vec3': (16, 3),
+    'vec4': (16, 4),
+}
+
+
+class UniformBlock:
+    """Bloque `layout(std140) uniform` descrito por un esquema de campos.
+
+    Cada campo es (tipo_glsl, nombre_glsl, ruta_en_config), p. ej.
+    ('vec3', 'u_brana_left_color', ('branas', 'left_color')). A partir del
+    esquema se genera la declaración GLSL y se empaquetan los valores con
+    NumPy siguiendo las reglas std140. El buffer se sube una sola vez por
+    cambio de config y queda en un binding point que varios programas
+    pueden compartir.
+    """
+
+    def __init__(self, name, fields, binding=0):
+        self.name = name
+        self.fields = fields
+        self.binding = binding
+        self.offsets = []
+        offset = 0
+        for gl_type, _, _ in fields:
+            align, components = STD140_TYPES[gl_type]
+            offset = (offset + align - 1) // align * align
+            self.offsets.append(offset)
+            offset += components * 4
+        # El tamaño del bloque se redondea a múltiplo de vec4
+        self.size = (offset + 15) // 16 * 16
+        self.ubo = None
+        self.uploaded = None
+
+    def declaration(self):
+        """Código GLSL del bloque; los miembros se usan sin prefijo en el shader."""
+        members = "\n".join(f"    {gl_type} {name};" for gl_type, name, _ in self.fields)
+        return f"layout(std140) uniform {self.name} {{\n{members}\n}};\n"
+
+    def pack(self, config):
+        """Empaqueta los valores del config con el layout std140."""
+        data = np.zeros(self.size // 4, dtype=np.float32)
+        for (gl_type, _, path), offset in zip(self.fields, self.offsets):
+            value = config
+            for key in path:
+                value = value[key]
+            start = offset // 4
+            data[start:start + STD140_TYPES[gl_type][1]] = value
+        return data
+
+    def upload(self, config):
+        """Sube el bloque si cambió respecto a la última subida."""
+        data = self.pack(config)
+        if self.ubo is None:
+            self.ubo = glGenBuffers(1)
+            glBindBuffer(GL_UNIFORM_BUFFER, self.ubo)
+            glBufferData(GL_UNIFORM_BUFFER, self.size, data, GL_DYNAMIC_DRAW)
+        elif self.uploaded is None or not np.array_equal(data, self.uploaded):
+            glBindBuffer(GL_UNIFORM_BUFFER, self.ubo)
+            glBufferSubData(GL_UNIFORM_BUFFER, 0, self.size, data)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+        glBindBufferBase(GL_UNIFORM_BUFFER, self.binding, self.ubo)
+        self.uploaded = data
+
+    def bind(self, program):
+        """Conecta el bloque del programa al binding point compartido."""
+        index = glGetUniformBlockIndex(program, self.name)
+        if index != GL_INVALID_INDEX:
+            glUniformBlockBinding(program, index, self.binding)